@@ -16,7 +16,6 @@ Uso:
 """
 
 import csv
-import sys
 from pathlib import Path
 from collections import defaultdict
 
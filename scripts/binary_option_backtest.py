@@ -5,7 +5,7 @@ Binary Option Pricing Backtest
 Compares theoretical probabilities (Black-Scholes N(d2)) against Polymarket
 implied probabilities for all shadow markets to find exploitable mispricing.
 
-Volatility from Binance is stddev of 1-second log-returns.
+Volatility from Chainlink is stddev of 1-second log-returns.
 Formula: d2 = ln(S/K) / (σ * √T), where T is in seconds.
 
 Usage:
@@ -14,6 +14,7 @@ Usage:
 
 import csv
 import math
+from collections import defaultdict
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -22,25 +23,12 @@ DATA_DIR = PROJECT_ROOT / "data" / "exports"
 
 # ── Normal CDF (no scipy dependency) ────────────────────────────────────────
 
+INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+
 def norm_cdf(x: float) -> float:
-    """Standard normal cumulative distribution function (Abramowitz & Stegun)."""
-    if x < -8:
-        return 0.0
-    if x > 8:
-        return 1.0
-    a1 = 0.254829592
-    a2 = -0.284496736
-    a3 = 1.421413741
-    a4 = -1.453152027
-    a5 = 1.061405429
-    p = 0.3275911
-    sign = 1 if x >= 0 else -1
-    x_abs = abs(x)
-    t = 1.0 / (1.0 + p * x_abs)
-    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(
-        -x_abs * x_abs / 2.0
-    )
-    return 0.5 * (1.0 + sign * y)
+    """Standard normal CDF via math.erf, the same formula as the live engine."""
+    return 0.5 * (1.0 + math.erf(x * INV_SQRT2))
 
 
 def calc_prob_above(price: float, strike: float, vol: float, T: float) -> float:
@@ -267,14 +255,11 @@ def main():
         except (ValueError, KeyError):
             pass
 
-    snap_results = []
-    by_cid = {}
+    by_cid = defaultdict(list)
     for sig in signals:
-        cid = sig.get("condition_id", "")
-        if cid not in by_cid:
-            by_cid[cid] = []
-        by_cid[cid].append(sig)
+        by_cid[sig.get("condition_id", "")].append(sig)
 
+    snap_results = []
     for cid, sigs in by_cid.items():
         outcome = market_outcomes.get(cid, "")
         vol = market_vols.get(cid)
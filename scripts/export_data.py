@@ -15,12 +15,22 @@ Uso:
 
 import csv
 import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 OUT_DIR = DATA_DIR / "exports"
 
+# Lectores del journal compartidos con el bot: las líneas corruptas se saltan
+# con un warning y los outcomes se aplican igual que en el executor (journal.py
+# no depende del cliente de trading)
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.strategies.tight_market_crypto.journal import (  # noqa: E402
+    read_jsonl,
+    read_trades,
+)
+
 
 def load_json(filename):
     path = DATA_DIR / filename
@@ -31,6 +41,14 @@ def load_json(filename):
         return json.load(f)
 
 
+def load_jsonl(filename):
+    path = DATA_DIR / filename
+    if not path.exists():
+        print(f"  [SKIP] {filename} no encontrado")
+        return []
+    return read_jsonl(path)
+
+
 # ── Trades ───────────────────────────────────────────────────────────────────
 
 TRADE_COLS = [
@@ -61,6 +79,7 @@ SHADOW_COLS = [
     "strike_price", "final_price",
     "volatility", "model_prob", "market_prob", "edge", "bet_side",
     "final_yes", "final_no",
+    "min_distance", "max_distance", "price_crossed_strike", "price_momentum_3s",
     "total_snapshots", "num_skipped_signals", "condition_id",
 ]
 
@@ -252,8 +271,17 @@ def main():
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
     print("Cargando datos...")
-    trades = load_json("tight_market_crypto_trades.json")
-    shadow = load_json("tight_market_crypto_shadow.json")
+    # Trade log: legacy JSON array + current JSONL, con outcomes del sidecar
+    trades = read_trades(
+        DATA_DIR / "tight_market_crypto_trades.jsonl",
+        DATA_DIR / "tight_market_crypto_outcomes.jsonl",
+        DATA_DIR / "tight_market_crypto_trades.json",
+    )
+    # Shadow log: legacy JSON array + current JSONL
+    shadow = (
+        load_json("tight_market_crypto_shadow.json")
+        + load_jsonl("tight_market_crypto_shadow.jsonl")
+    )
 
     print(f"\nExportando a {OUT_DIR}/")
     export_trades(trades)
@@ -3,8 +3,7 @@
 Per-crypto diagnostic: identifies optimal min_volatility and min_edge per asset.
 Run: docker compose run --rm analyze python /app/scripts/per_crypto_diagnostic.py
 """
-import csv, os, sys
-from collections import defaultdict
+import csv, os
 
 DATA_DIR = os.environ.get("DATA_DIR", "/app/data/exports")
 
@@ -1,10 +1,11 @@
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderBookSummary
+from py_clob_client.clob_types import BookParams, OrderBookSummary
 
 from .config import Config
 from .models import MarketInfo
@@ -12,12 +13,19 @@ from .models import MarketInfo
 logger = logging.getLogger("polyagent")
 
 GAMMA_API_URL = "https://gamma-api.polymarket.com"
+# Concurrent single-book requests when the bulk /books request fails
+BOOK_FALLBACK_WORKERS = 16
+# Tokens per bulk /books request; larger lists are split and sent concurrently
+BOOKS_BATCH_MAX = 100
 
 
 class PolymarketClient:
     def __init__(self, config: Config):
         self.config = config
         self._init_clob_client()
+        self._book_pool = ThreadPoolExecutor(
+            max_workers=BOOK_FALLBACK_WORKERS, thread_name_prefix="CLOB-Book"
+        )
 
     def _init_clob_client(self) -> None:
         cfg = self.config
@@ -42,6 +50,10 @@ class PolymarketClient:
             self.clob.set_api_creds(creds)
             logger.info("Auto-generated API credentials")
 
+    def close(self) -> None:
+        """Stop the book-request worker threads; queued requests are cancelled."""
+        self._book_pool.shutdown(wait=False, cancel_futures=True)
+
     def get_active_markets(self) -> list[MarketInfo]:
         """Fetch ALL active markets from Gamma API using offset pagination."""
         markets: list[MarketInfo] = []
@@ -221,3 +233,36 @@ class PolymarketClient:
             return None
         # Asks come sorted descending (highest first), best ask = lowest price
         return min(float(a.price) for a in book.asks)
+
+    def get_best_asks(self, token_ids: list[str]) -> dict[str, float | None]:
+        """Best ask per token from bulk /books requests (None if no asks).
+
+        Up to BOOKS_BATCH_MAX tokens go in one request; longer lists are
+        split into chunks fetched concurrently.
+        """
+        asks: dict[str, float | None] = dict.fromkeys(token_ids)
+        if not token_ids:
+            return asks
+        # One BookParams per distinct token (the dict dedupes repeats)
+        params = [BookParams(token_id=t) for t in asks]
+        chunks = [
+            params[i:i + BOOKS_BATCH_MAX]
+            for i in range(0, len(params), BOOKS_BATCH_MAX)
+        ]
+        try:
+            if len(chunks) == 1:
+                books = self.clob.get_order_books(params)
+            else:
+                books = [
+                    b
+                    for part in self._book_pool.map(self.clob.get_order_books, chunks)
+                    for b in part
+                ]
+        except Exception as e:
+            # Fall back to per-token requests, dispatched concurrently
+            logger.debug(f"Order books error for {len(token_ids)} tokens: {e}")
+            return dict(zip(asks, self._book_pool.map(self.get_best_ask, asks)))
+        for book in books:
+            if book.asks and book.asset_id in asks:
+                asks[book.asset_id] = min(float(a.price) for a in book.asks)
+        return asks
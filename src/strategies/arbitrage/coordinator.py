@@ -44,9 +44,12 @@ class ArbitrageCoordinator:
         # Fetch initial market list
         logger.info("ArbitrageCoordinator: fetching initial market list...")
         client_for_fetch = PolymarketClient(self.config)
-        with self._markets_lock:
-            self._markets = client_for_fetch.get_active_markets()
-            self._markets.sort(key=lambda m: m.liquidity, reverse=True)
+        try:
+            with self._markets_lock:
+                self._markets = client_for_fetch.get_active_markets()
+                self._markets.sort(key=lambda m: m.liquidity, reverse=True)
+        finally:
+            client_for_fetch.close()
         total_coverage = self.config.scanner_workers * self.config.markets_per_worker
         logger.info(
             f"ArbitrageCoordinator: starting {self.config.scanner_workers} "
@@ -101,6 +104,7 @@ class ArbitrageCoordinator:
     def join(self, timeout: float = 10.0) -> None:
         for t in self._threads:
             t.join(timeout=timeout)
+        self._executor_client.close()
 
     def _get_slice(self, worker_id: int) -> list[MarketInfo]:
         with self._markets_lock:
@@ -113,7 +117,12 @@ class ArbitrageCoordinator:
         # Each worker gets its own client (each has its own HTTP session)
         client = PolymarketClient(self.config)
         scanner = ArbitrageScanner(client, self.config)
+        try:
+            self._scan_until_stopped(worker_id, scanner)
+        finally:
+            client.close()
 
+    def _scan_until_stopped(self, worker_id: int, scanner: ArbitrageScanner) -> None:
         while self._running:
             try:
                 markets_slice = self._get_slice(worker_id)
@@ -178,7 +187,10 @@ class ArbitrageCoordinator:
             try:
                 logger.info("ArbitrageCoordinator: refreshing market list...")
                 client = PolymarketClient(self.config)
-                new_markets = client.get_active_markets()
+                try:
+                    new_markets = client.get_active_markets()
+                finally:
+                    client.close()
                 new_markets.sort(key=lambda m: m.liquidity, reverse=True)
                 with self._markets_lock:
                     self._markets = new_markets
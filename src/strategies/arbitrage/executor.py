@@ -219,4 +219,4 @@ class TradeExecutor:
             entry["llm_reason"] = result.analysis.reason
 
         trades.append(entry)
-        TRADES_FILE.write_text(json.dumps(trades, indent=2))
+        TRADES_FILE.write_text(json.dumps(trades, separators=(",", ":")))
@@ -17,14 +17,19 @@ class ArbitrageScanner:
         opportunities: list[ArbitrageOpportunity] = []
         num_markets = len(markets)
 
+        # YES/NO asks for the whole slice, fetched in bulk up front
+        asks = self.client.get_best_asks(
+            [t for m in markets for t in m.token_ids[:2]]
+        )
+
         for i, market in enumerate(markets):
             if (i + 1) % 50 == 0 or i == 0:
                 logger.info(f"Scanning market {i + 1}/{num_markets}...")
 
             yes_token, no_token = market.token_ids[0], market.token_ids[1]
 
-            yes_ask = self.client.get_best_ask(yes_token)
-            no_ask = self.client.get_best_ask(no_token)
+            yes_ask = asks.get(yes_token)
+            no_ask = asks.get(no_token)
 
             if yes_ask is None or no_ask is None:
                 continue
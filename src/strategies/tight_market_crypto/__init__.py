@@ -1 +1,8 @@
-from .coordinator import TightMarketCryptoCoordinator
+def __getattr__(name):
+    # Lazy so the journal readers (scripts/export_data.py) import without
+    # pulling in numpy and the trading client
+    if name == "TightMarketCryptoCoordinator":
+        from .coordinator import TightMarketCryptoCoordinator
+
+        return TightMarketCryptoCoordinator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,10 +1,11 @@
-import json
 import logging
 import math
 import threading
 import time
 from collections import deque
 
+import numpy as np
+import orjson
 import websocket
 
 logger = logging.getLogger("polyagent")
@@ -27,6 +28,34 @@ SYMBOL_TO_ASSET = {
 MAX_HISTORY = 1800  # ~30 minutes at 1 update/sec
 
 
+def _history_arrays(
+    points: list[tuple[float, float]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Split (timestamp, price) points into time-ordered arrays."""
+    if not points:
+        return np.empty(0), np.empty(0)
+    arr = np.array(points, dtype=np.float64)
+    order = np.argsort(arr[:, 0], kind="stable")
+    return arr[order, 0], arr[order, 1]
+
+
+def _log_return_std(
+    points: list[tuple[float, float]], cutoff: float
+) -> float | None:
+    """Stddev of log-returns between consecutive points at or after cutoff.
+
+    Points are taken in arrival order; None with fewer than 10 in the window.
+    """
+    if not points:
+        return None
+    # Window filter and log-returns, vectorized; prices are always > 0
+    arr = np.array(points, dtype=np.float64)
+    px = arr[arr[:, 0] >= cutoff, 1]
+    if len(px) < 10:
+        return None
+    return float(np.diff(np.log(px)).std())
+
+
 class BinancePriceFeed:
     """Real-time crypto price feed from Binance WebSocket.
 
@@ -71,55 +100,42 @@ class BinancePriceFeed:
         Falls back to latest price if no history is available.
         """
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return self._prices.get(asset)
-
-            best_price = None
-            best_diff = float("inf")
-            for ts, px in hist:
-                diff = abs(ts - target_ts)
-                if diff < best_diff:
-                    best_diff = diff
-                    best_price = px
-
-            # If closest point is more than 60s away, not reliable
-            if best_price is not None and best_diff <= 60:
-                return best_price
-
-            return self._prices.get(asset)
-
-    def get_volatility(self, asset: str, window_seconds: int = 300) -> float | None:
+            points = list(self._history.get(asset) or ())
+            latest = self._prices.get(asset)
+        if not points:
+            return latest
+
+        # Vectorized nearest-point scan outside the lock (first one on ties)
+        arr = np.array(points, dtype=np.float64)
+        diff = np.abs(arr[:, 0] - target_ts)
+        closest = int(np.argmin(diff))
+        # If closest point is more than 60s away, not reliable
+        return float(arr[closest, 1]) if diff[closest] <= 60 else latest
+
+    def get_volatility(
+        self, asset: str, window_seconds: int = 300, now: float | None = None
+    ) -> float | None:
         """Compute stddev of 1-second log-returns over the given window.
 
         Returns None if insufficient data (< 10 data points in window).
+        Pass ``now`` to share one clock reading across several calls.
         """
-        now = time.time()
-        cutoff = now - window_seconds
-
+        if now is None:
+            now = time.time()
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return None
-            points = [(ts, px) for ts, px in hist if ts >= cutoff]
-
-        if len(points) < 10:
-            return None
-
-        # Compute log-returns between consecutive points
-        returns = []
-        for i in range(1, len(points)):
-            prev_px = points[i - 1][1]
-            curr_px = points[i][1]
-            if prev_px > 0:
-                returns.append(math.log(curr_px / prev_px))
-
-        if len(returns) < 5:
-            return None
-
-        mean = sum(returns) / len(returns)
-        variance = sum((r - mean) ** 2 for r in returns) / len(returns)
-        return math.sqrt(variance)
+            points = list(self._history.get(asset) or ())
+        return _log_return_std(points, now - window_seconds)
+
+    def get_price_and_volatility(
+        self, asset: str, window_seconds: int = 300, now: float | None = None
+    ) -> tuple[float | None, float | None]:
+        """get_price() and get_volatility() from a single locked read."""
+        if now is None:
+            now = time.time()
+        with self._lock:
+            price = self._prices.get(asset)
+            points = list(self._history.get(asset) or ())
+        return price, _log_return_std(points, now - window_seconds)
 
     def get_expected_move(
         self, asset: str, seconds_remaining: float, window_seconds: int = 300
@@ -139,36 +155,71 @@ class BinancePriceFeed:
         self, asset: str, strike: float, since_ts: float
     ) -> bool:
         """Check if the price has been on both sides of strike since since_ts."""
+        return self.has_price_crossed_bulk(asset, [(strike, since_ts)])[0]
+
+    def has_price_crossed_bulk(
+        self, asset: str, queries: list[tuple[float, float]]
+    ) -> list[bool]:
+        """has_price_crossed for many (strike, since_ts) pairs on one asset.
+
+        One history copy; suffix min/max over the time-ordered prices answer
+        each pair with a binary search instead of a rescan.
+        """
         now = time.time()
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return False
-            points = [px for ts, px in hist if ts >= since_ts and ts <= now]
-
-        if len(points) < 2:
-            return False
-
-        seen_above = False
-        seen_below = False
-        for px in points:
-            if px > strike:
-                seen_above = True
-            elif px < strike:
-                seen_below = True
-            if seen_above and seen_below:
-                return True
-        return False
+            points = list(self._history.get(asset) or ())
+        ts, px = _history_arrays(points)
+        n = int(np.searchsorted(ts, now, side="right"))
+        if n < 2:
+            return [False] * len(queries)
+        ts, px = ts[:n], px[:n]
+        suffix_max = np.maximum.accumulate(px[::-1])[::-1]
+        suffix_min = np.minimum.accumulate(px[::-1])[::-1]
+
+        crossed = []
+        for strike, since_ts in queries:
+            i = int(np.searchsorted(ts, since_ts))
+            crossed.append(
+                n - i >= 2
+                and bool(suffix_max[i] > strike)
+                and bool(suffix_min[i] < strike)
+            )
+        return crossed
 
     def get_price_history(
         self, asset: str, start_ts: float, end_ts: float
-    ) -> list[tuple[float, float]]:
-        """Return list of (timestamp, price) between start_ts and end_ts."""
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return (timestamps, prices) arrays between start_ts and end_ts, time-ordered."""
+        with self._lock:
+            hist = list(self._history.get(asset) or ())
+        points = [(ts, px) for ts, px in hist if start_ts <= ts <= end_ts]
+        return _history_arrays(points)
+
+    def get_window_and_final(
+        self, asset: str, window_start_ts: float, end_ts: float
+    ) -> tuple[np.ndarray, np.ndarray, float | None]:
+        """Return (timestamps, prices, final_price) for a window ending at end_ts.
+
+        One copy of the history: the arrays match get_price_history() and
+        final_price matches get_price_at(asset, end_ts). The lock is only held
+        for the copy; the scan runs vectorized outside it.
+        """
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return []
-            return [(ts, px) for ts, px in hist if start_ts <= ts <= end_ts]
+            points = list(self._history.get(asset) or ())
+            latest = self._prices.get(asset)
+        if not points:
+            return np.empty(0), np.empty(0), latest
+
+        arr = np.array(points, dtype=np.float64)
+        ts = arr[:, 0]
+        diff = np.abs(ts - end_ts)
+        closest = int(np.argmin(diff))
+        # If closest point is more than 60s away, not reliable
+        final_price = float(arr[closest, 1]) if diff[closest] <= 60 else latest
+
+        window = arr[(ts >= window_start_ts) & (ts <= end_ts)]
+        order = np.argsort(window[:, 0], kind="stable")
+        return window[order, 0], window[order, 1], final_price
 
     # --- WebSocket internals ---
 
@@ -195,8 +246,8 @@ class BinancePriceFeed:
 
     def _on_message(self, message: str) -> None:
         try:
-            data = json.loads(message)
-        except json.JSONDecodeError:
+            data = orjson.loads(message)
+        except orjson.JSONDecodeError:
             return
 
         symbol = data.get("s", "")  # e.g. "BTCUSDT"
@@ -217,8 +268,8 @@ class BinancePriceFeed:
             self._prices[asset] = price
             self._history[asset].append((now, price))
 
-        # Log prices every 30 seconds
-        if now - self._last_log >= 30:
+        # Log prices every 30 seconds (skips the locked summary when INFO is off)
+        if now - self._last_log >= 30 and logger.isEnabledFor(logging.INFO):
             self._last_log = now
             with self._lock:
                 parts = []
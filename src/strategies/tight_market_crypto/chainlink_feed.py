@@ -1,10 +1,11 @@
 import json
 import logging
-import math
 import threading
 import time
 from collections import deque
 
+import numpy as np
+import orjson
 import websocket
 
 logger = logging.getLogger("polyagent")
@@ -21,11 +22,40 @@ ASSET_TO_SYMBOL = {
     "XRP": "xrp/usd",
 }
 SYMBOL_TO_ASSET = {v: k for k, v in ASSET_TO_SYMBOL.items()}
+# Subscribe frames are re-sent every POLL_INTERVAL, so serialize them once
+SUBSCRIBE_MESSAGES = [
+    json.dumps({
+        "action": "subscribe",
+        "subscriptions": [{
+            "topic": SUBSCRIBE_TOPIC,
+            "type": "*",
+            "filters": json.dumps({"symbol": symbol}),
+        }],
+    })
+    for symbol in ASSET_TO_SYMBOL.values()
+]
 
 MAX_HISTORY = 1800  # ~30 minutes at 1 update/sec
 POLL_INTERVAL = 0.5  # Re-subscribe every N seconds to get fresh data
 
 
+def _log_return_std(
+    points: list[tuple[float, float]], cutoff: float
+) -> float | None:
+    """Stddev of log-returns between consecutive points at or after cutoff.
+
+    Points are taken in arrival order; None with fewer than 10 in the window.
+    """
+    if not points:
+        return None
+    # Window filter and log-returns, vectorized; prices are always > 0
+    arr = np.array(points, dtype=np.float64)
+    px = arr[arr[:, 0] >= cutoff, 1]
+    if len(px) < 10:
+        return None
+    return float(np.diff(np.log(px)).std())
+
+
 class ChainlinkPriceFeed:
     """Real-time crypto price feed from Polymarket's Chainlink RTDS WebSocket.
 
@@ -86,104 +116,69 @@ class ChainlinkPriceFeed:
         Falls back to latest price if no history is available.
         """
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return self._prices.get(asset)
-
-            best_price = None
-            best_diff = float("inf")
-            for ts, px in hist:
-                diff = abs(ts - target_ts)
-                if diff < best_diff:
-                    best_diff = diff
-                    best_price = px
-
-            # If closest point is more than 60s away, not reliable
-            if best_price is not None and best_diff <= 60:
-                return best_price
-
-            return self._prices.get(asset)
-
-    def get_volatility(self, asset: str, window_seconds: int = 300) -> float | None:
+            points = list(self._history.get(asset) or ())
+            latest = self._prices.get(asset)
+        if not points:
+            return latest
+
+        # Vectorized nearest-point scan outside the lock (first one on ties)
+        arr = np.array(points, dtype=np.float64)
+        diff = np.abs(arr[:, 0] - target_ts)
+        closest = int(np.argmin(diff))
+        # If closest point is more than 60s away, not reliable
+        return float(arr[closest, 1]) if diff[closest] <= 60 else latest
+
+    def get_volatility(
+        self, asset: str, window_seconds: int = 300, now: float | None = None
+    ) -> float | None:
         """Compute stddev of 1-second log-returns over the given window.
 
         Returns None if insufficient data (< 10 data points in window).
+        Pass ``now`` to share one clock reading across several calls.
         """
-        now = time.time()
-        cutoff = now - window_seconds
-
+        if now is None:
+            now = time.time()
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return None
-            points = [(ts, px) for ts, px in hist if ts >= cutoff]
-
-        if len(points) < 10:
-            return None
-
-        # Compute log-returns between consecutive points
-        returns = []
-        for i in range(1, len(points)):
-            prev_px = points[i - 1][1]
-            curr_px = points[i][1]
-            if prev_px > 0:
-                returns.append(math.log(curr_px / prev_px))
-
-        if len(returns) < 5:
-            return None
-
-        mean = sum(returns) / len(returns)
-        variance = sum((r - mean) ** 2 for r in returns) / len(returns)
-        return math.sqrt(variance)
-
-    def get_expected_move(
-        self, asset: str, seconds_remaining: float, window_seconds: int = 300
-    ) -> float | None:
-        """Expected $ move = volatility * current_price * sqrt(seconds_remaining)."""
-        vol = self.get_volatility(asset, window_seconds)
-        if vol is None:
-            return None
-
-        price = self.get_price(asset)
-        if price is None or price <= 0:
-            return None
-
-        return vol * price * math.sqrt(max(0, seconds_remaining))
-
-    def has_price_crossed(
-        self, asset: str, strike: float, since_ts: float
-    ) -> bool:
-        """Check if the price has been on both sides of strike since since_ts."""
-        now = time.time()
+            points = list(self._history.get(asset) or ())
+        return _log_return_std(points, now - window_seconds)
+
+    def get_price_and_volatility(
+        self, asset: str, window_seconds: int = 300, now: float | None = None
+    ) -> tuple[float | None, float | None]:
+        """get_price() and get_volatility() from a single locked read."""
+        if now is None:
+            now = time.time()
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return False
-            points = [px for ts, px in hist if ts >= since_ts and ts <= now]
-
-        if len(points) < 2:
-            return False
-
-        seen_above = False
-        seen_below = False
-        for px in points:
-            if px > strike:
-                seen_above = True
-            elif px < strike:
-                seen_below = True
-            if seen_above and seen_below:
-                return True
-        return False
-
-    def get_price_history(
-        self, asset: str, start_ts: float, end_ts: float
-    ) -> list[tuple[float, float]]:
-        """Return list of (timestamp, price) between start_ts and end_ts."""
+            price = self._prices.get(asset)
+            points = list(self._history.get(asset) or ())
+        return price, _log_return_std(points, now - window_seconds)
+
+    def get_window_and_final(
+        self, asset: str, window_start_ts: float, end_ts: float
+    ) -> tuple[np.ndarray, np.ndarray, float | None]:
+        """Return (timestamps, prices, final_price) for a window ending at end_ts.
+
+        One copy of the history: the arrays hold the time-ordered points in
+        [window_start_ts, end_ts] and final_price matches get_price_at(asset,
+        end_ts). The lock is only held for the copy; the scan runs vectorized
+        outside it.
+        """
         with self._lock:
-            hist = self._history.get(asset)
-            if not hist:
-                return []
-            return [(ts, px) for ts, px in hist if start_ts <= ts <= end_ts]
+            points = list(self._history.get(asset) or ())
+            latest = self._prices.get(asset)
+        if not points:
+            return np.empty(0), np.empty(0), latest
+
+        arr = np.array(points, dtype=np.float64)
+        ts = arr[:, 0]
+        diff = np.abs(ts - end_ts)
+        closest = int(np.argmin(diff))
+        # If closest point is more than 60s away, not reliable
+        final_price = float(arr[closest, 1]) if diff[closest] <= 60 else latest
+
+        window = arr[(ts >= window_start_ts) & (ts <= end_ts)]
+        order = np.argsort(window[:, 0], kind="stable")
+        return window[order, 0], window[order, 1], final_price
 
     # --- WebSocket internals ---
 
@@ -229,15 +224,7 @@ class ChainlinkPriceFeed:
         self._ws_ready.set()
 
     def _send_subscriptions(self, ws) -> None:
-        for symbol in ASSET_TO_SYMBOL.values():
-            sub_msg = json.dumps({
-                "action": "subscribe",
-                "subscriptions": [{
-                    "topic": SUBSCRIBE_TOPIC,
-                    "type": "*",
-                    "filters": json.dumps({"symbol": symbol}),
-                }],
-            })
+        for sub_msg in SUBSCRIBE_MESSAGES:
             ws.send(sub_msg)
 
     def _on_message(self, message: str) -> None:
@@ -245,8 +232,8 @@ class ChainlinkPriceFeed:
             return
 
         try:
-            data = json.loads(message)
-        except json.JSONDecodeError:
+            data = orjson.loads(message)
+        except orjson.JSONDecodeError:
             return
 
         # Response topic is "crypto_prices" (not the subscribe topic)
@@ -296,9 +283,9 @@ class ChainlinkPriceFeed:
                 to_remove = {t for t in seen if t < cutoff_ms}
                 seen -= to_remove
 
-        # Log prices every 30 seconds
+        # Log prices every 30 seconds (skips the locked summary when INFO is off)
         wall_now = time.time()
-        if wall_now - self._last_log >= 30:
+        if wall_now - self._last_log >= 30 and logger.isEnabledFor(logging.INFO):
             self._last_log = wall_now
             with self._lock:
                 parts = []
@@ -1,40 +1,138 @@
-import json
 import logging
+import math
 import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+
 from src.core.client import PolymarketClient
 from src.core.config import Config
 
 from .chainlink_feed import ChainlinkPriceFeed
 from .executor import TightMarketCryptoExecutor
+from .journal import JournalWriter
 from .market_finder import CryptoMarketFinder
 from .signal_engine import SignalEngine
 from .tightness_tracker import TightnessTracker
 
 logger = logging.getLogger("polyagent")
 
-SHADOW_FILE = Path("data/tight_market_crypto_shadow.json")
+SHADOW_FILE = Path("data/tight_market_crypto_shadow.jsonl")  # one JSON entry per line
+
+# Main loop sleep bounds (seconds)
+MIN_SLEEP = 0.05
+MAX_SLEEP = 2.0
+# Wait after a window opens / expires so the Chainlink price at that instant
+# has arrived before capturing the strike / resolving
+PRICE_SETTLE_SECONDS = 5.0
+# Cap for discovery backoff while nothing is tracked (multiple of base interval)
+MAX_DISCOVERY_BACKOFF = 4
+# After a failed discovery pass, no early (maintenance) retry before this delay
+DISCOVERY_RETRY_SECONDS = 5.0
+# Pending shadow entries; past this new entries are dropped (and logged)
+SHADOW_QUEUE_SIZE = 1000
+# Fixed shadow entry schema: entries are filled from a presized copy
+SHADOW_ENTRY_TEMPLATE: dict = dict.fromkeys((
+    "timestamp", "condition_id", "question", "asset",
+    "strike_price", "final_price", "outcome", "was_traded",
+    "total_snapshots", "final_yes", "final_no",
+    # Black-Scholes model fields
+    "volatility", "model_prob", "market_prob", "edge", "bet_side",
+    # Execution-window price action
+    "min_distance", "max_distance", "price_crossed_strike", "price_momentum_3s",
+    # Trails
+    "crypto_price_trail_exec_window", "crypto_price_trail_entry_window",
+    "odds_trail_exec_window", "odds_trail_entry_window",
+    "skipped_signals",
+))
+
+
+def _last_in_bucket(ts: np.ndarray, bucket_size: int) -> np.ndarray:
+    """Indices of the last sample of each bucket_size-second bucket (ts must be sorted)."""
+    buckets = ts.astype(np.int64) // bucket_size
+    return np.flatnonzero(np.append(buckets[1:] != buckets[:-1], True))
+
+
+def _bucket_trail(
+    ts: np.ndarray,
+    px: np.ndarray,
+    bucket_size: int,
+    end_ts: float,
+    strike: float | None,
+    decimals: int,
+    want_dist: bool,
+) -> list[dict]:
+    """Downsample a time-ordered price history to one trail point per bucket."""
+    if not len(ts):
+        return []
+    idx = _last_in_bucket(ts, bucket_size)
+    # Gather once; rounding is vectorized over the whole trail
+    sel_px = px[idx]
+    t = np.round(end_ts - ts[idx], 1).tolist()
+    price = np.round(sel_px, decimals).tolist()
+    if want_dist:
+        dist = np.round(np.abs(sel_px - strike), decimals).tolist()
+        return [{"t": a, "price": b, "dist": c} for a, b, c in zip(t, price, dist)]
+    return [{"t": a, "price": b} for a, b in zip(t, price)]
+
+
+def _odds_trails(
+    history: tuple[np.ndarray, np.ndarray, np.ndarray],
+    entry_start_ts: float,
+    exec_start_ts: float,
+    end_ts: float,
+) -> tuple[list[dict], list[dict]]:
+    """Build (exec, entry) odds trails from a market's snapshot arrays.
+
+    The exec trail keeps the last snapshot per second, the entry trail the
+    last snapshot per 5 seconds. Snapshots are recorded in time order, so
+    each window start is found by binary search.
+    """
+    ts, yes, no = history
+
+    def _trail(start_ts: float, bucket_size: int) -> list[dict]:
+        i = int(np.searchsorted(ts, start_ts))
+        if i == len(ts):
+            return []
+        idx = i + _last_in_bucket(ts[i:], bucket_size)
+        return [
+            {"t": a, "yes": b, "no": c}
+            for a, b, c in zip(
+                np.round(end_ts - ts[idx], 1).tolist(),
+                np.round(yes[idx], 4).tolist(),
+                np.round(no[idx], 4).tolist(),
+            )
+        ]
+
+    return _trail(exec_start_ts, 1), _trail(entry_start_ts, 5)
 
 
 class TightMarketCryptoCoordinator:
     """Single-loop coordinator for tight market crypto strategy.
 
-    Only two threads total:
-    - WebSocket thread (inside TightnessTracker) for real-time odds
-    - Main loop thread: discovery → signal check → execute → sleep
+    Threads:
+    - WebSocket thread (inside TightnessTracker) for real-time odds; wakes the
+      main loop when a market near its execution window gets fresh odds
+    - Main loop thread: discovery → signal check → execute → wait
+    - Shadow writer thread: appends shadow log entries off the main loop
     """
 
     def __init__(self, config: Config):
         self.config = config
         self._running = False
         self._thread: threading.Thread | None = None
+        # Shadow entries are appended by a background thread
+        self._shadow_writer = JournalWriter(
+            "TMC-ShadowWriter", maxsize=SHADOW_QUEUE_SIZE
+        )
 
         self._client = PolymarketClient(config)
         self._finder = CryptoMarketFinder(config)
-        self._tracker = TightnessTracker(config)
+        # Woken by the WS thread on fresh odds near the execution window
+        self._wake = threading.Event()
+        self._tracker = TightnessTracker(config, wake=self._wake)
         self._chainlink_feed = ChainlinkPriceFeed()
         self._signal_engine = SignalEngine(
             config, self._tracker, self._client, self._chainlink_feed
@@ -42,6 +140,10 @@ class TightMarketCryptoCoordinator:
         self._executor = TightMarketCryptoExecutor(self._client, config)
 
         self._last_discovery = 0.0
+        self._discovery_interval = float(config.tmc_discovery_interval)
+        self._next_maintenance = math.inf  # next window open / expiry needing discovery
+        self._next_window_open = math.inf  # earliest unsettled start_ts still needing a strike
+        self._discovery_retry_at = 0.0  # set after a failed discovery pass
 
     def start(self) -> None:
         self._running = True
@@ -51,6 +153,10 @@ class TightMarketCryptoCoordinator:
         self._tracker.start()
         self._chainlink_feed.start()
 
+        # Trade journal and shadow log writers
+        self._executor.start()
+        self._shadow_writer.start()
+
         self._thread = threading.Thread(
             target=self._main_loop, name="TMC-Main", daemon=True
         )
@@ -59,27 +165,39 @@ class TightMarketCryptoCoordinator:
     def stop(self) -> None:
         logger.info("[TMC] Shutting down...")
         self._running = False
+        self._wake.set()
         self._tracker.stop()
         self._chainlink_feed.stop()
 
     def join(self, timeout: float = 5.0) -> None:
         if self._thread:
             self._thread.join(timeout=timeout)
+        # Main loop is done producing: flush both journal writers, then stop
+        self._executor.close(timeout=timeout)
+        self._shadow_writer.close(timeout=timeout)
+        self._client.close()
+        self._finder.close()
 
     def _main_loop(self) -> None:
         # Initial discovery immediately
-        self._discover_and_clean()
+        self._run_discovery(time.time())
 
         while self._running:
             try:
-                # Periodic discovery
+                # Discovery on schedule, or early when a window opened / market expired
                 now = time.time()
-                if now - self._last_discovery >= self.config.tmc_discovery_interval:
-                    self._discover_and_clean()
-                    self._last_discovery = now
-
-                # Check signals and execute immediately
-                opportunities = self._signal_engine.check_signals()
+                if (
+                    now - self._last_discovery >= self._discovery_interval
+                    or self._next_maintenance <= now
+                ) and now >= self._discovery_retry_at:
+                    self._run_discovery(now)
+
+                # Check signals (only while some market can fire) and execute immediately
+                opportunities = (
+                    self._signal_engine.check_signals()
+                    if self._tracker.has_actionable_markets()
+                    else []
+                )
                 for opp in opportunities:
                     if not self._running:
                         break
@@ -96,41 +214,106 @@ class TightMarketCryptoCoordinator:
             except Exception as e:
                 logger.error(f"[TMC] Main loop error: {e}")
 
-            # Faster polling when markets are close to expiry
-            profiles = self._tracker.get_all_profiles()
-            min_remaining = min((p.seconds_remaining for p in profiles), default=999)
-            if min_remaining <= self.config.tmc_execution_window + 5:
-                time.sleep(0.15)
-            else:
-                time.sleep(0.5)
+            # Wait until the next scheduled event or fresh odds, whichever first
+            pass_end = time.time()
+            wake = self._next_wakeup(pass_end)
+            self._wake.wait(min(max(wake - pass_end, MIN_SLEEP), MAX_SLEEP))
+            self._wake.clear()
+            # The WS thread may have set the event during the pass, ending the
+            # wait at once; passes (and their bulk /books requests) are still
+            # at least MIN_SLEEP apart. Odds arriving meanwhile set the event
+            # again for the next wait
+            rest = pass_end + MIN_SLEEP - time.time()
+            if rest > 0:
+                time.sleep(rest)
+
+    def _next_wakeup(self, now: float) -> float:
+        """Timestamp of the next event the main loop must react to.
+
+        Markets inside their entry window keep the 0.5s signal cadence
+        (0.15s close to the execution window). Otherwise the loop only wakes
+        when a market enters its entry window, a window opens that still
+        needs a strike, a market expires, or discovery is due. Window opens
+        and expiries also schedule an early discovery pass via
+        ``self._next_maintenance``, PRICE_SETTLE_SECONDS after the event so
+        the Chainlink price at it is in the feed history.
+
+        Every threshold is monotonic in end_ts, so only the earliest expiry
+        (maintained by the tracker) matters.
+        """
+        cfg = self.config
+        wake = self._last_discovery + self._discovery_interval
+        next_expiry = self._tracker.next_expiry_ts()
+        remaining = next_expiry - now
+        if remaining <= cfg.tmc_execution_window + 5:
+            wake = min(wake, now + 0.15)
+        elif remaining <= cfg.tmc_entry_window:
+            wake = min(wake, now + 0.5)
+        else:
+            wake = min(wake, next_expiry - cfg.tmc_entry_window)
+
+        # Expired markets are removed on every discovery pass, so the earliest
+        # expiry always lies after the last one
+        self._next_maintenance = (
+            min(next_expiry, self._next_window_open) + PRICE_SETTLE_SECONDS
+        )
+        return min(wake, max(self._next_maintenance, self._discovery_retry_at))
+
+    def _run_discovery(self, now: float) -> None:
+        """Run a discovery pass; a failed pass counts as one for scheduling.
+
+        Otherwise a Gamma outage would leave maintenance overdue and the loop
+        re-crawling on every tick.
+        """
+        self._last_discovery = now
+        try:
+            self._discover_and_clean()
+        except Exception as e:
+            logger.error(f"[TMC] Discovery error: {e}")
+            self._discovery_retry_at = now + DISCOVERY_RETRY_SECONDS
 
     def _discover_and_clean(self) -> None:
-        now = datetime.now(timezone.utc)
+        now_ts = time.time()
+
+        # Snapshot tracked markets once for the whole pass
+        tracked_markets = self._tracker.snapshot()
 
         # Clean expired markets and record outcomes using Chainlink price
-        expired_count = 0
-        traded_cids = self._executor.get_traded_condition_ids()
-        for cid in list(self._tracker.tracked_condition_ids()):
-            market = self._tracker.get_tracked_market(cid)
-            if market and market.end_date < now:
-                # Capture profile BEFORE removal for shadow log
+        history_window = max(
+            self.config.tmc_entry_window, self.config.tmc_execution_window
+        )
+        expired: list[str] = []
+        vol_cache: dict[str, float | None] = {}  # asset -> volatility, this pass only
+        # (asset, end_ts) -> feed window and close price; markets of different
+        # durations on one asset often close at the same instant
+        window_cache: dict[tuple[str, float], tuple] = {}
+        for cid, market in list(tracked_markets.items()):
+            if market.end_ts < now_ts:
+                # Capture profile and odds history BEFORE removal for shadow log
                 profile = self._tracker.get_profile(cid)
+                odds_history = self._tracker.get_history(cid)
                 skipped = self._signal_engine.get_skipped_signals(cid)
 
                 self._tracker.remove_market(cid)
                 self._signal_engine.mark_expired(cid)
-                logger.info(
-                    f"[TMC] Expired: {market.asset} '{market.question[:50]}'"
-                )
+                del tracked_markets[cid]
+                expired.append(f"  {market.asset} '{market.label}'")
+
+                # Price history for the shadow log and the price at window close,
+                # in one pass over the Chainlink feed
+                key = (market.asset, market.end_ts)
+                window = window_cache.get(key)
+                if window is None:
+                    window = window_cache[key] = self._chainlink_feed.get_window_and_final(
+                        market.asset, market.end_ts - history_window, market.end_ts
+                    )
+                hist_ts, hist_px, close_price = window
 
                 # Determine outcome from Chainlink price at window close vs strike
                 final_price = None
                 outcome = None
                 if market.strike_price is not None:
-                    end_ts = market.end_date.timestamp()
-                    final_price = self._chainlink_feed.get_price_at(
-                        market.asset, end_ts
-                    )
+                    final_price = close_price
                     if final_price is not None:
                         outcome = "YES" if final_price > market.strike_price else "NO"
                         self._executor.update_outcomes_for_condition(
@@ -147,144 +330,171 @@ class TightMarketCryptoCoordinator:
                     cid=cid,
                     market=market,
                     profile=profile,
+                    odds_history=odds_history,
                     final_price=final_price,
+                    price_history=(hist_ts, hist_px),
                     outcome=outcome,
-                    was_traded=cid in traded_cids,
+                    was_traded=self._executor.is_traded(cid),
                     skipped_signals=skipped,
+                    now_ts=now_ts,
+                    vol_cache=vol_cache,
                 )
-
-                expired_count += 1
-        if expired_count:
-            logger.info(f"[TMC] Cleaned {expired_count} expired markets")
+        if expired:
+            cleaned = "\n".join(expired)
+            logger.info(f"[TMC] Cleaned {len(expired)} expired markets:\n{cleaned}")
 
         # Discover new markets
         markets = self._finder.find_upcoming_markets()
-        already_tracked = self._tracker.tracked_condition_ids()
-        new_count = 0
-        for market in markets:
-            if market.condition_id not in already_tracked:
-                self._tracker.add_market(market)
-                new_count += 1
-
-        tracked = len(self._tracker.tracked_condition_ids())
+        new_markets = [m for m in markets if m.condition_id not in tracked_markets]
+        new_count = self._tracker.add_markets(new_markets)
+        tracked_markets.update((m.condition_id, m) for m in new_markets)
+
+        tracked = len(tracked_markets)
         if new_count:
             logger.info(f"[TMC] Added {new_count} new markets (tracking {tracked} total)")
 
-        # Capture strike prices for markets whose window has opened
-        for cid in self._tracker.tracked_condition_ids():
-            market = self._tracker.get_tracked_market(cid)
-            if not market or market.strike_price is not None:
+        # Back off discovery while nothing is tracked, snap back once markets appear
+        base_interval = float(self.config.tmc_discovery_interval)
+        if tracked:
+            self._discovery_interval = base_interval
+        else:
+            self._discovery_interval = min(
+                self._discovery_interval * 2, base_interval * MAX_DISCOVERY_BACKOFF
+            )
+
+        # Capture strike prices for markets whose window opened at least
+        # PRICE_SETTLE_SECONDS ago; earlier, the feed's closest point to
+        # start_ts is usually still a pre-open tick
+        captured: list[str] = []
+        next_window_open = math.inf
+        # (asset, start_ts) -> price; windows on one asset often open together
+        open_prices: dict[tuple[str, float], float | None] = {}
+        for market in self._tracker.pending_strike_markets():
+            if market.start_ts + PRICE_SETTLE_SECONDS > now_ts:
+                next_window_open = min(next_window_open, market.start_ts)
                 continue
-            if market.start_date and market.start_date <= now:
-                price = self._chainlink_feed.get_price_at(
-                    market.asset, market.start_date.timestamp()
-                )
-                if price is not None:
-                    market.strike_price = price
-                    logger.info(
-                        f"[TMC] Strike captured: {market.asset}=${price:,.2f} "
-                        f"for '{market.question[:50]}'"
-                    )
-
-        # Status summary of tracked markets
-        if tracked > 0:
-            profiles = self._tracker.get_all_profiles()
-            for p in profiles:
-                logger.info(
-                    f"[TMC] STATUS: {p.market.asset} '{p.market.question[:45]}' | "
-                    f"{p.seconds_remaining:.0f}s left | "
-                    f"snaps={len(p.snapshots)} | "
-                    f"YES={p.current_yes:.3f} NO={p.current_no:.3f}"
+            key = (market.asset, market.start_ts)
+            if key in open_prices:
+                price = open_prices[key]
+            else:
+                price = open_prices[key] = self._chainlink_feed.get_price_at(*key)
+            if price is not None:
+                self._tracker.set_strike(market, price)
+                captured.append(
+                    f"  {market.asset}=${price:,.2f} for '{market.label}'"
                 )
+        self._next_window_open = next_window_open
+        if captured:
+            strikes = "\n".join(captured)
+            logger.info(f"[TMC] Strikes captured:\n{strikes}")
+
+        # Status summary of tracked markets, as a single log record
+        if tracked > 0 and logger.isEnabledFor(logging.INFO):
+            status = "\n".join(
+                f"  {p.market.asset} '{p.market.question[:45]}' | "
+                f"{p.seconds_remaining:.0f}s left | "
+                f"snaps={p.snapshot_count} | "
+                f"YES={p.current_yes:.3f} NO={p.current_no:.3f}"
+                for p in self._tracker.get_all_profiles()
+            )
+            logger.info(f"[TMC] STATUS:\n{status}")
 
     def _save_shadow_entry(
         self,
         cid: str,
         market,
         profile,
+        odds_history: tuple[np.ndarray, np.ndarray, np.ndarray] | None,
         final_price: float | None,
+        price_history: tuple[np.ndarray, np.ndarray],
         outcome: str | None,
         was_traded: bool,
         skipped_signals: list[dict],
+        now_ts: float,
+        vol_cache: dict[str, float | None],
     ) -> None:
+        strike = market.strike_price
+        timestamp = datetime.fromtimestamp(now_ts, timezone.utc).isoformat()
+
+        # Fast path: nothing was observed for this market (no odds, no
+        # strike), so the entry skips the trail and model work; it keeps the
+        # regular schema with empty values
+        if strike is None and not (profile and profile.snapshot_count):
+            entry = SHADOW_ENTRY_TEMPLATE.copy()
+            entry["timestamp"] = timestamp
+            entry["condition_id"] = cid
+            entry["question"] = market.question
+            entry["asset"] = market.asset
+            entry["was_traded"] = was_traded
+            entry["total_snapshots"] = 0
+            entry["crypto_price_trail_exec_window"] = []
+            entry["crypto_price_trail_entry_window"] = []
+            entry["odds_trail_exec_window"] = []
+            entry["odds_trail_entry_window"] = []
+            entry["skipped_signals"] = skipped_signals
+            self._append_shadow(entry)
+            logger.info(
+                f"[TMC] Shadow logged: {market.asset} '{market.question[:40]}' | no_data"
+            )
+            return
+
         exec_window = self.config.tmc_execution_window
         entry_window = self.config.tmc_entry_window
-        end_ts = market.end_date.timestamp()
+        end_ts = market.end_ts
         exec_start_ts = end_ts - exec_window
         entry_start_ts = end_ts - entry_window
-        strike = market.strike_price
-
-        # Decimal precision based on asset price magnitude
-        decimals = 6 if strike and strike < 10 else (4 if strike and strike < 1000 else 2)
-
-        # Crypto price trail during execution window
-        crypto_exec_trail = []
-        crypto_entry_trail = []
-
-        raw_exec_history = self._chainlink_feed.get_price_history(
-            market.asset, exec_start_ts, end_ts
+        decimals = market.decimals
+
+        # Crypto price history covers both windows; slice each from it
+        hist_ts, hist_px = price_history
+        i = int(np.searchsorted(hist_ts, entry_start_ts))
+        entry_ts, entry_px = hist_ts[i:], hist_px[i:]
+        i = int(np.searchsorted(hist_ts, exec_start_ts))
+        exec_ts, exec_px = hist_ts[i:], hist_px[i:]
+        crypto_exec_trail = _bucket_trail(
+            exec_ts, exec_px, 1, end_ts, strike, decimals,
+            want_dist=strike is not None,
         )
-        raw_entry_history = self._chainlink_feed.get_price_history(
-            market.asset, entry_start_ts, end_ts
+        crypto_entry_trail = _bucket_trail(
+            entry_ts, entry_px, 5, end_ts, strike, decimals, want_dist=False
         )
 
-        if raw_exec_history:
-            seen_seconds = set()
-            for ts, px in raw_exec_history:
-                sec_key = int(ts)
-                if sec_key not in seen_seconds:
-                    seen_seconds.add(sec_key)
-                    trail_entry = {
-                        "t": round(end_ts - ts, 1),
-                        "price": round(px, decimals),
-                    }
-                    if strike is not None:
-                        trail_entry["dist"] = round(abs(px - strike), decimals)
-                    crypto_exec_trail.append(trail_entry)
-
-        if raw_entry_history:
-            seen_5s = set()
-            for ts, px in raw_entry_history:
-                bucket = int(ts) // 5
-                if bucket not in seen_5s:
-                    seen_5s.add(bucket)
-                    crypto_entry_trail.append({
-                        "t": round(end_ts - ts, 1),
-                        "price": round(px, decimals),
-                    })
-
-        # YES/NO odds trail during execution window
+        # Price action vs strike during execution window
+        min_distance = None
+        max_distance = None
+        price_crossed_strike = None
+        if strike is not None and len(exec_px):
+            dist = np.abs(exec_px - strike)
+            min_distance = round(float(dist.min()), decimals)
+            max_distance = round(float(dist.max()), decimals)
+            sides = exec_px > strike
+            price_crossed_strike = bool(np.any(sides[1:] != sides[:-1]))
+
+        # Price momentum ($/s) over the final 3 seconds
+        price_momentum = None
+        i = int(np.searchsorted(exec_ts, end_ts - 3))
+        if len(exec_ts) - i >= 2:
+            ts_3s = exec_ts[i:]
+            px_3s = exec_px[i:]
+            dt = ts_3s[-1] - ts_3s[0]
+            if dt > 0:
+                price_momentum = round(float((px_3s[-1] - px_3s[0]) / dt), decimals)
+
+        # YES/NO odds trails during execution and entry windows
         odds_exec_trail = []
         odds_entry_trail = []
-        if profile and profile.snapshots:
-            seen_seconds_odds = set()
-            for snap in profile.snapshots:
-                if snap.timestamp >= exec_start_ts:
-                    sec_key = int(snap.timestamp)
-                    if sec_key not in seen_seconds_odds:
-                        seen_seconds_odds.add(sec_key)
-                        odds_exec_trail.append({
-                            "t": round(end_ts - snap.timestamp, 1),
-                            "yes": round(snap.yes_price, 4),
-                            "no": round(snap.no_price, 4),
-                        })
-
-            seen_5s_odds = set()
-            for snap in profile.snapshots:
-                if snap.timestamp >= entry_start_ts:
-                    bucket = int(snap.timestamp) // 5
-                    if bucket not in seen_5s_odds:
-                        seen_5s_odds.add(bucket)
-                        odds_entry_trail.append({
-                            "t": round(end_ts - snap.timestamp, 1),
-                            "yes": round(snap.yes_price, 4),
-                            "no": round(snap.no_price, 4),
-                        })
-
-        # Volatility at expiry
-        volatility = self._chainlink_feed.get_volatility(
-            market.asset, self.config.tmc_volatility_window
-        )
+        if odds_history is not None and len(odds_history[0]):
+            odds_exec_trail, odds_entry_trail = _odds_trails(
+                odds_history, entry_start_ts, exec_start_ts, end_ts
+            )
+
+        # Volatility at expiry, computed once per asset per cleanup pass
+        if market.asset in vol_cache:
+            volatility = vol_cache[market.asset]
+        else:
+            volatility = vol_cache[market.asset] = self._chainlink_feed.get_volatility(
+                market.asset, self.config.tmc_volatility_window
+            )
 
         # Extract model fields from skipped signals (last evaluation)
         model_prob = None
@@ -298,44 +508,51 @@ class TightMarketCryptoCoordinator:
             edge = last_skip.get("edge")
             bet_side = last_skip.get("bet_side")
 
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "condition_id": cid,
-            "question": market.question,
-            "asset": market.asset,
-            "strike_price": strike,
-            "final_price": final_price,
-            "outcome": outcome,
-            "was_traded": was_traded,
-            "total_snapshots": len(profile.snapshots) if profile else 0,
-            "final_yes": profile.current_yes if profile else None,
-            "final_no": profile.current_no if profile else None,
-            # Black-Scholes model fields
-            "volatility": round(volatility, 8) if volatility else None,
-            "model_prob": model_prob,
-            "market_prob": market_prob,
-            "edge": edge,
-            "bet_side": bet_side,
-            # Trails (compact, 1/sec for exec window, 1/5sec for entry window)
-            "crypto_price_trail_exec_window": crypto_exec_trail,
-            "crypto_price_trail_entry_window": crypto_entry_trail,
-            "odds_trail_exec_window": odds_exec_trail,
-            "odds_trail_entry_window": odds_entry_trail,
-            "skipped_signals": skipped_signals,
-        }
-
-        SHADOW_FILE.parent.mkdir(parents=True, exist_ok=True)
-        entries = []
-        if SHADOW_FILE.exists():
-            try:
-                entries = json.loads(SHADOW_FILE.read_text())
-            except (json.JSONDecodeError, OSError):
-                entries = []
-
-        entries.append(entry)
-        SHADOW_FILE.write_text(json.dumps(entries, indent=2))
+        entry = SHADOW_ENTRY_TEMPLATE.copy()
+        entry["timestamp"] = timestamp
+        entry["condition_id"] = cid
+        entry["question"] = market.question
+        entry["asset"] = market.asset
+        entry["strike_price"] = strike
+        entry["final_price"] = final_price
+        entry["outcome"] = outcome
+        entry["was_traded"] = was_traded
+        entry["total_snapshots"] = profile.snapshot_count if profile else 0
+        entry["final_yes"] = profile.current_yes if profile else None
+        entry["final_no"] = profile.current_no if profile else None
+        # Black-Scholes model fields
+        entry["volatility"] = round(volatility, 8) if volatility else None
+        entry["model_prob"] = model_prob
+        entry["market_prob"] = market_prob
+        entry["edge"] = edge
+        entry["bet_side"] = bet_side
+        # Execution-window price action
+        entry["min_distance"] = min_distance
+        entry["max_distance"] = max_distance
+        entry["price_crossed_strike"] = price_crossed_strike
+        entry["price_momentum_3s"] = price_momentum
+        # Trails (compact, 1/sec for exec window, 1/5sec for entry window)
+        entry["crypto_price_trail_exec_window"] = crypto_exec_trail
+        entry["crypto_price_trail_entry_window"] = crypto_entry_trail
+        entry["odds_trail_exec_window"] = odds_exec_trail
+        entry["odds_trail_entry_window"] = odds_entry_trail
+        entry["skipped_signals"] = skipped_signals
+
+        self._append_shadow(entry)
         logger.info(
             f"[TMC] Shadow logged: {market.asset} '{market.question[:40]}' | "
             f"outcome={outcome} traded={was_traded} skips={len(skipped_signals)} | "
             f"model_prob={model_prob} edge={edge}"
         )
+
+    def _append_shadow(self, entry: dict) -> None:
+        """Hand an entry to the writer thread; never blocks the trading loop.
+
+        If the writer has fallen SHADOW_QUEUE_SIZE entries behind, the entry
+        is dropped and logged.
+        """
+        if not self._shadow_writer.put(SHADOW_FILE, entry):
+            logger.error(
+                f"[TMC] Shadow queue full, dropped entry for "
+                f"{entry.get('condition_id')}"
+            )
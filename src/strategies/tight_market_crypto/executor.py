@@ -1,19 +1,46 @@
-import json
 import logging
 import threading
-from datetime import datetime, timezone
-from pathlib import Path
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
-from py_clob_client.clob_types import MarketOrderArgs, OrderType
+from py_clob_client.clob_types import (
+    MarketOrderArgs,
+    OrderType,
+    PartialCreateOrderOptions,
+)
 
 from src.core.client import PolymarketClient
 from src.core.config import Config
 
+from .journal import (
+    OUTCOMES_FILE,
+    TRADES_FILE,
+    JournalWriter,
+    apply_outcome,
+    read_trades,
+)
 from .models import TightMarketOpportunity, TightMarketTradeResult
 
 logger = logging.getLogger("polyagent")
 
-TRADES_FILE = Path("data/tight_market_crypto_trades.json")
+
+# Fixed trade row schema, in journal column order. Rows are filled from a
+# presized per-executor copy with the constant fields already set.
+TRADE_ENTRY_TEMPLATE: dict = dict.fromkeys((
+    "timestamp", "strategy", "condition_id", "question", "asset",
+    "yes_ask", "no_ask", "buy_side", "buy_ask", "amount", "total_cost",
+    "strike_price", "current_crypto_price",
+    "model_prob", "market_prob", "edge", "volatility", "seconds_remaining",
+    "success", "order_ids", "cost", "error", "dry_run",
+    # Filled in post-resolution by update_outcomes_for_condition()
+    "outcome", "final_crypto_price", "payout", "net_return", "return_pct",
+))
+
+
+def _next_utc_midnight(ts: float) -> float:
+    """Epoch seconds of the first UTC midnight after ts."""
+    return (ts // 86400 + 1) * 86400
 
 
 class TightMarketCryptoExecutor:
@@ -21,21 +48,52 @@ class TightMarketCryptoExecutor:
         self.client = client
         self.config = config
         self._daily_loss = 0.0
-        self._daily_reset = datetime.now(timezone.utc).date()
+        self._next_reset_ts = _next_utc_midnight(time.time())
         self._killed = False
         self._lock = threading.Lock()
+        # Runs the independent pre-sign CLOB lookups concurrently
+        self._lookup_pool = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="TMC-Lookup"
+        )
+        self._entry_template = TRADE_ENTRY_TEMPLATE | {
+            "strategy": "tight_market_crypto",
+            "dry_run": config.dry_run,
+        }
+        # In-memory journal + condition_id -> row index, so outcome updates
+        # never rescan the file; rewrites are deferred and batched
+        self._trades: list[dict] = read_trades()
+        self._cid_to_indices: dict[str, list[int]] = defaultdict(list)
+        for i, t in enumerate(self._trades):
+            if t.get("condition_id"):
+                self._cid_to_indices[t["condition_id"]].append(i)
+        # Journal appends run on a background thread, in submission order;
+        # started by start(), drained and stopped by close()
+        self._journal = JournalWriter("TMC-TradeWriter")
+
+    def start(self) -> None:
+        """Start the journal writer thread."""
+        self._journal.start()
 
     def execute(self, opp: TightMarketOpportunity) -> TightMarketTradeResult:
+        # Unlocked bool read: a stale False only defers to the locked check
+        if self._killed:
+            return self._killed_result(opp)
+        if self.config.dry_run:
+            # No financial state changes; lock only for the journal append
+            return self._execute_dry(opp)
         with self._lock:
             return self._execute_inner(opp)
 
+    def _killed_result(self, opp: TightMarketOpportunity) -> TightMarketTradeResult:
+        return TightMarketTradeResult(
+            opportunity=opp,
+            success=False,
+            error="Kill switch activated - max daily loss reached",
+        )
+
     def _execute_inner(self, opp: TightMarketOpportunity) -> TightMarketTradeResult:
         if self._killed:
-            return TightMarketTradeResult(
-                opportunity=opp,
-                success=False,
-                error="Kill switch activated - max daily loss reached",
-            )
+            return self._killed_result(opp)
 
         self._maybe_reset_daily()
 
@@ -51,28 +109,29 @@ class TightMarketCryptoExecutor:
                 error="Kill switch - max daily loss",
             )
 
-        if self.config.dry_run:
-            logger.info(
-                f"[TMC] [DRY RUN] Would buy "
-                f"{opp.buy_side}@{opp.buy_ask:.4f} ${opp.amount:.2f} "
-                f"on '{opp.market.question[:50]}' | "
-                f"strike=${opp.strike_price:,.2f} "
-                f"model_prob={opp.model_prob:.3f} edge={opp.edge:.3f}"
-            )
-            result = TightMarketTradeResult(
-                opportunity=opp,
-                success=True,
-                cost=opp.total_cost,
-            )
-            self._save_trade(result)
-            return result
-
         return self._execute_live(opp)
 
+    def _execute_dry(self, opp: TightMarketOpportunity) -> TightMarketTradeResult:
+        logger.info(
+            f"[TMC] [DRY RUN] Would buy "
+            f"{opp.buy_side}@{opp.buy_ask:.4f} ${opp.amount:.2f} "
+            f"on '{opp.market.label}' | "
+            f"strike=${opp.strike_price:,.2f} "
+            f"model_prob={opp.model_prob:.3f} edge={opp.edge:.3f}"
+        )
+        result = TightMarketTradeResult(
+            opportunity=opp,
+            success=True,
+            cost=opp.total_cost,
+        )
+        with self._lock:
+            self._save_trade(result)
+        return result
+
     def _execute_live(self, opp: TightMarketOpportunity) -> TightMarketTradeResult:
         order_ids = []
         asset = opp.market.asset
-        q = opp.market.question[:50]
+        q = opp.market.label
         logger.info(
             f"[TMC] EXECUTING {asset} '{q}' | "
             f"BUY {opp.buy_side}@${opp.buy_ask:.4f} ${opp.amount:.2f} | "
@@ -84,13 +143,27 @@ class TightMarketCryptoExecutor:
                 f"[TMC] Creating {opp.buy_side} market order: "
                 f"token={opp.buy_token_id[:12]}... amount=${opp.amount:.2f}"
             )
-            signed = self.client.clob.create_market_order(
+            # Tick size, neg-risk flag and book-derived price are separate
+            # HTTP round trips; fetch them in parallel instead of serially
+            # inside create_market_order
+            clob = self.client.clob
+            tick_f = self._lookup_pool.submit(clob.get_tick_size, opp.buy_token_id)
+            neg_f = self._lookup_pool.submit(clob.get_neg_risk, opp.buy_token_id)
+            price_f = self._lookup_pool.submit(
+                clob.calculate_market_price,
+                opp.buy_token_id, "BUY", opp.amount, OrderType.FOK,
+            )
+            signed = clob.create_market_order(
                 MarketOrderArgs(
                     token_id=opp.buy_token_id,
                     amount=opp.amount,
                     side="BUY",
+                    price=price_f.result(),
                     order_type=OrderType.FOK,
-                )
+                ),
+                PartialCreateOrderOptions(
+                    tick_size=tick_f.result(), neg_risk=neg_f.result()
+                ),
             )
             logger.info(f"[TMC] {opp.buy_side} order signed, posting...")
             resp = self.client.clob.post_order(signed, OrderType.FOK)
@@ -129,109 +202,79 @@ class TightMarketCryptoExecutor:
     ) -> None:
         """Enrich log entries for condition_id with resolution outcome and return metrics.
 
-        Uses the Chainlink final_price vs strike to determine win/loss.
+        Uses the Chainlink final_price vs strike to determine win/loss. The
+        resolution is appended to the outcomes journal as a single line.
         """
-        if not TRADES_FILE.exists():
-            return
-        try:
-            trades = json.loads(TRADES_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            return
-
-        changed = False
-        for entry in trades:
-            if entry.get("condition_id") != condition_id:
-                continue
-            if entry.get("outcome") is not None:
-                continue  # Already filled
-
-            buy_side = entry.get("buy_side", "")
-            buy_ask = entry.get("buy_ask", 0)
-            amount = entry.get("amount", 0)
-
-            if buy_side == outcome and buy_ask > 0:
-                payout = amount / buy_ask
-            else:
-                payout = 0
-
-            net_return = payout - amount
-            return_pct = (net_return / amount * 100) if amount > 0 else 0.0
-
-            entry["outcome"] = outcome
-            entry["payout"] = round(payout, 4)
-            entry["net_return"] = round(net_return, 4)
-            entry["return_pct"] = round(return_pct, 2)
-            if final_price is not None:
-                entry["final_crypto_price"] = final_price
-            changed = True
-
-            logger.info(
-                f"[TMC] Outcome recorded: {entry['asset']} '{entry['question'][:50]}' | "
-                f"winner={outcome} payout=${payout:.2f} net=${net_return:+.2f} ({return_pct:+.1f}%)"
-                f"{f' | final_price=${final_price:,.2f}' if final_price else ''}"
-            )
+        with self._lock:
+            filled = False
+            for i in self._cid_to_indices.get(condition_id, ()):
+                entry = self._trades[i]
+                if entry.get("outcome") is not None:
+                    continue  # Already filled
+
+                apply_outcome(entry, outcome, final_price)
+                filled = True
+
+                logger.info(
+                    f"[TMC] Outcome recorded: {entry['asset']} '{entry['question'][:50]}' | "
+                    f"winner={outcome} payout=${entry['payout']:.2f} "
+                    f"net=${entry['net_return']:+.2f} ({entry['return_pct']:+.1f}%)"
+                    f"{f' | final_price=${final_price:,.2f}' if final_price else ''}"
+                )
 
-        if changed:
-            TRADES_FILE.write_text(json.dumps(trades, indent=2))
+            if filled:
+                self._journal.put(OUTCOMES_FILE, {
+                    "condition_id": condition_id,
+                    "outcome": outcome,
+                    "final_price": final_price,
+                })
 
     def _maybe_reset_daily(self) -> None:
-        today = datetime.now(timezone.utc).date()
-        if today != self._daily_reset:
+        now = time.time()
+        if now >= self._next_reset_ts:
             self._daily_loss = 0.0
-            self._daily_reset = today
+            self._next_reset_ts = _next_utc_midnight(now)
             self._killed = False
             logger.info("[TMC] Daily loss counter reset")
 
-    def get_traded_condition_ids(self) -> set[str]:
-        if not TRADES_FILE.exists():
-            return set()
-        try:
-            trades = json.loads(TRADES_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            return set()
-        return {t["condition_id"] for t in trades if t.get("condition_id")}
+    def is_traded(self, condition_id: str) -> bool:
+        """O(1) membership check against the in-memory trade index."""
+        with self._lock:
+            return condition_id in self._cid_to_indices
 
     def _save_trade(self, result: TightMarketTradeResult) -> None:
-        TRADES_FILE.parent.mkdir(parents=True, exist_ok=True)
-
-        trades = []
-        if TRADES_FILE.exists():
-            try:
-                trades = json.loads(TRADES_FILE.read_text())
-            except (json.JSONDecodeError, OSError):
-                trades = []
-
-        entry = {
-            "timestamp": result.timestamp,
-            "strategy": "tight_market_crypto",
-            "condition_id": result.opportunity.market.condition_id,
-            "question": result.opportunity.market.question,
-            "asset": result.opportunity.market.asset,
-            "yes_ask": result.opportunity.yes_ask,
-            "no_ask": result.opportunity.no_ask,
-            "buy_side": result.opportunity.buy_side,
-            "buy_ask": result.opportunity.buy_ask,
-            "amount": result.opportunity.amount,
-            "total_cost": result.opportunity.total_cost,
-            "strike_price": result.opportunity.strike_price,
-            "current_crypto_price": result.opportunity.current_crypto_price,
-            "model_prob": result.opportunity.model_prob,
-            "market_prob": result.opportunity.market_prob,
-            "edge": result.opportunity.edge,
-            "volatility": result.opportunity.volatility,
-            "seconds_remaining": result.opportunity.profile.seconds_remaining,
-            "success": result.success,
-            "order_ids": result.order_ids,
-            "cost": result.cost,
-            "error": result.error,
-            "dry_run": self.config.dry_run,
-            # Filled in post-resolution by update_outcomes_for_condition()
-            "outcome": None,
-            "final_crypto_price": None,
-            "payout": None,
-            "net_return": None,
-            "return_pct": None,
-        }
-
-        trades.append(entry)
-        TRADES_FILE.write_text(json.dumps(trades, indent=2))
+        """Index and queue a trade row. Caller holds self._lock."""
+        opp = result.opportunity
+        market = opp.market
+        entry = self._entry_template.copy()
+        entry["timestamp"] = result.timestamp
+        entry["condition_id"] = market.condition_id
+        entry["question"] = market.question
+        entry["asset"] = market.asset
+        entry["yes_ask"] = opp.yes_ask
+        entry["no_ask"] = opp.no_ask
+        entry["buy_side"] = opp.buy_side
+        entry["buy_ask"] = opp.buy_ask
+        entry["amount"] = opp.amount
+        entry["total_cost"] = opp.total_cost
+        entry["strike_price"] = opp.strike_price
+        entry["current_crypto_price"] = opp.current_crypto_price
+        entry["model_prob"] = opp.model_prob
+        entry["market_prob"] = opp.market_prob
+        entry["edge"] = opp.edge
+        entry["volatility"] = opp.volatility
+        entry["seconds_remaining"] = opp.profile.seconds_remaining
+        entry["success"] = result.success
+        entry["order_ids"] = result.order_ids
+        entry["cost"] = result.cost
+        entry["error"] = result.error
+
+        self._cid_to_indices[entry["condition_id"]].append(len(self._trades))
+        self._trades.append(entry)
+
+        self._journal.put(TRADES_FILE, entry)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the lookup workers, drain pending journal writes and stop the writer."""
+        self._lookup_pool.shutdown(wait=False, cancel_futures=True)
+        self._journal.close(timeout=timeout)
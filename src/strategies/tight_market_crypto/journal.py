@@ -0,0 +1,191 @@
+import logging
+import os
+import queue
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import BinaryIO
+
+import orjson
+
+logger = logging.getLogger("polyagent")
+
+WRITE_BATCH_MAX = 64  # journal rows drained per writer wakeup
+
+TRADES_FILE = Path("data/tight_market_crypto_trades.jsonl")  # one JSON entry per line
+# Resolutions, one {"condition_id", "outcome", "final_price"} per line; merged
+# into the trade rows on load so the trade journal itself is append-only
+OUTCOMES_FILE = Path("data/tight_market_crypto_outcomes.jsonl")
+# Pre-journal trade log (one JSON array, no longer written); still loaded so
+# trades made before the switch stay traded and get their outcomes
+LEGACY_TRADES_FILE = Path("data/tight_market_crypto_trades.json")
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    """Stream a journal line by line, skipping (with a warning) torn lines."""
+    rows = []
+    bad = 0
+    try:
+        with path.open("rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    bad += 1
+    except OSError:
+        return []
+    if bad:
+        logger.warning(f"[TMC] Skipped {bad} undecodable line(s) in {path.name}")
+    return rows
+
+
+def _read_legacy_trades(path: Path) -> list[dict]:
+    """Rows of the legacy JSON array trade log ([] if missing or unreadable)."""
+    try:
+        rows = orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return []
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.error(f"[TMC] Could not read legacy trade log {path.name}: {e}")
+        return []
+    if not isinstance(rows, list):
+        return []
+    return [r for r in rows if isinstance(r, dict)]
+
+
+def apply_outcome(entry: dict, outcome: str, final_price: float | None) -> None:
+    """Fill a trade row's post-resolution fields from the market outcome."""
+    buy_ask = entry.get("buy_ask", 0)
+    amount = entry.get("amount", 0)
+
+    if entry.get("buy_side", "") == outcome and buy_ask > 0:
+        payout = amount / buy_ask
+    else:
+        payout = 0
+
+    net_return = payout - amount
+    return_pct = (net_return / amount * 100) if amount > 0 else 0.0
+
+    entry["outcome"] = outcome
+    entry["payout"] = round(payout, 4)
+    entry["net_return"] = round(net_return, 4)
+    entry["return_pct"] = round(return_pct, 2)
+    if final_price is not None:
+        entry["final_crypto_price"] = final_price
+
+
+def read_trades(
+    trades_file: Path = TRADES_FILE,
+    outcomes_file: Path = OUTCOMES_FILE,
+    legacy_file: Path = LEGACY_TRADES_FILE,
+) -> list[dict]:
+    """Load the trade journal with recorded outcomes merged in.
+
+    Legacy JSON-array trades come first; outcomes resolved after the switch
+    to the journal are merged into them from the outcomes file as well.
+    """
+    trades = _read_legacy_trades(legacy_file) + read_jsonl(trades_file)
+    outcomes = {o.get("condition_id"): o for o in read_jsonl(outcomes_file)}
+    if outcomes:
+        for t in trades:
+            o = outcomes.get(t.get("condition_id"))
+            if o and t.get("outcome") is None:
+                apply_outcome(t, o["outcome"], o.get("final_price"))
+    return trades
+
+
+def open_journal(path: Path) -> BinaryIO:
+    """Open a journal for appending, terminating a torn last line first.
+
+    A crash mid-write can leave the file without its trailing newline; the
+    next row would then be glued onto the torn one and lost with it.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fh = path.open("a+b")
+    try:
+        if fh.seek(0, os.SEEK_END) > 0:
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b"\n":
+                fh.write(b"\n")
+                fh.flush()
+    except BaseException:
+        fh.close()
+        raise
+    return fh
+
+
+class JournalWriter:
+    """Appends JSON rows to journals on a background thread, in submission order.
+
+    One append handle per journal stays open for the thread's lifetime;
+    each batch becomes one write + fsync per journal touched.
+    """
+
+    def __init__(self, name: str, maxsize: int = 0):
+        # Each item is (journal path, row); None = stop
+        self._queue: queue.Queue[tuple[Path, dict] | None] = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, path: Path, row: dict) -> bool:
+        """Queue a row without blocking; False if the queue is full."""
+        try:
+            self._queue.put_nowait((path, row))
+        except queue.Full:
+            return False
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain pending rows, then stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        handles: dict[Path, BinaryIO] = {}
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < WRITE_BATCH_MAX:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = None in batch
+                # Failures are logged and never end the thread: an
+                # unserializable row is dropped on its own, a failed write
+                # costs that journal's batch
+                pending: dict[Path, list[bytes]] = defaultdict(list)
+                for item in batch:
+                    if item is None:
+                        break
+                    path, row = item
+                    try:
+                        pending[path].append(
+                            orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+                        )
+                    except Exception as e:
+                        logger.error(
+                            f"[TMC] Journal row for {row.get('condition_id')} "
+                            f"not serializable ({path.name}): {e}"
+                        )
+                for path, lines in pending.items():
+                    try:
+                        fh = handles.get(path)
+                        if fh is None:
+                            fh = handles[path] = open_journal(path)
+                        fh.write(b"".join(lines))
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                    except Exception as e:
+                        logger.error(f"[TMC] Journal write error ({path.name}): {e}")
+                if stop:
+                    return
+        finally:
+            for fh in handles.values():
+                fh.close()
@@ -1,11 +1,15 @@
-import json
 import logging
 import re
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 from zoneinfo import ZoneInfo
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.core.config import Config
 
@@ -14,13 +18,25 @@ from .models import CryptoMarket
 logger = logging.getLogger("polyagent")
 
 GAMMA_API_URL = "https://gamma-api.polymarket.com"
+PAGE_SIZE = 100
+ET = ZoneInfo("America/New_York")
+PAGE_CONCURRENCY = 4  # Gamma pages requested in parallel per wave
+ISO_SECONDS = "%Y-%m-%dT%H:%M:%S"  # seconds-resolution prefix of Gamma dates
+
+# Canonical asset symbol -> regex alternatives naming it in a question
+ASSET_ALTERNATIVES: dict[str, str] = {
+    "BTC": "BTC|Bitcoin",
+    "ETH": "ETH|Ethereum",
+    "SOL": "SOL|Solana",
+    "XRP": "XRP",
+}
 
-# Maps regex patterns to canonical asset symbols
-ASSET_PATTERNS: dict[str, re.Pattern] = {
-    "BTC": re.compile(r"\b(BTC|Bitcoin)\b", re.IGNORECASE),
-    "ETH": re.compile(r"\b(ETH|Ethereum)\b", re.IGNORECASE),
-    "SOL": re.compile(r"\b(SOL|Solana)\b", re.IGNORECASE),
-    "XRP": re.compile(r"\bXRP\b", re.IGNORECASE),
+# Uppercase substrings that must appear for the asset pattern to possibly match
+ASSET_KEYWORDS: dict[str, tuple[str, ...]] = {
+    "BTC": ("BTC", "BITCOIN"),
+    "ETH": ("ETH",),  # also covers "ETHEREUM"
+    "SOL": ("SOL",),  # also covers "SOLANA"
+    "XRP": ("XRP",),
 }
 
 # Pattern matching 15-minute window markets (e.g. "11:15AM-11:30AM")
@@ -30,83 +46,125 @@ FIFTEEN_MIN_WINDOW_PATTERN = re.compile(
 )
 
 
+def _asset_pattern(assets) -> re.Pattern:
+    """Single alternation over assets: the named group that matched is the symbol."""
+    groups = "|".join(
+        f"(?P<{a}>{alt})" for a, alt in ASSET_ALTERNATIVES.items() if a in assets
+    )
+    return re.compile(rf"\b(?:{groups})\b", re.IGNORECASE)
+
+
 class CryptoMarketFinder:
     def __init__(self, config: Config):
         self.config = config
         self._allowed_assets = set(
             a.strip().upper() for a in config.tmc_crypto_assets.split(",")
         )
+        # Asset regex and substring prefilter, restricted to the assets we trade
+        self._asset_pattern = _asset_pattern(self._allowed_assets)
+        self._keywords = tuple(
+            k for a in self._allowed_assets for k in ASSET_KEYWORDS.get(a, ())
+        )
+        # Keep-alive session: pages and discovery cycles reuse one TLS connection.
+        # requests already negotiates gzip; transient connect/read errors are
+        # retried on the pooled connection instead of aborting the crawl.
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = "polyagent"
+        self._session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=Retry(total=2, backoff_factor=0.2),
+            ),
+        )
+        self._page_pool = ThreadPoolExecutor(
+            max_workers=PAGE_CONCURRENCY, thread_name_prefix="TMC-Gamma"
+        )
+
+    def close(self) -> None:
+        """Stop the page-fetch worker threads and release pooled connections."""
+        self._page_pool.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
 
     def find_upcoming_markets(self) -> list[CryptoMarket]:
         now = datetime.now(timezone.utc)
+        # String bounds for the 1-20 minute end window, padded by a second
+        # for the truncated comparison; the exact check runs after parsing
+        end_bounds = (
+            (now + timedelta(seconds=59)).strftime(ISO_SECONDS),
+            (now + timedelta(seconds=1201)).strftime(ISO_SECONDS),
+        )
         markets: list[CryptoMarket] = []
         offset = 0
-        limit = 100
 
-        while True:
-            params: dict[str, Any] = {
-                "limit": limit,
-                "offset": offset,
-                "active": "true",
-                "closed": "false",
-            }
-
-            try:
-                resp = requests.get(
-                    f"{GAMMA_API_URL}/markets", params=params, timeout=15
-                )
-                resp.raise_for_status()
-            except requests.RequestException as e:
-                logger.error(f"[TMC] Gamma API error: {e}")
-                break
-
-            items = resp.json()
-            if not isinstance(items, list) or not items:
-                break
-
-            for m in items:
-                market = self._parse_crypto_market(m, now)
-                if market:
-                    markets.append(market)
-
-            if len(items) < limit:
-                break
-            offset += limit
+        # Fetch pages in waves of PAGE_CONCURRENCY; pages are processed in
+        # offset order and the crawl stops at the first short/failed page
+        done = False
+        while not done:
+            offsets = [offset + k * PAGE_SIZE for k in range(PAGE_CONCURRENCY)]
+            for items in self._page_pool.map(self._fetch_page, offsets):
+                if not items:
+                    done = True
+                    break
+
+                for m in items:
+                    market = self._parse_crypto_market(m, now, end_bounds)
+                    if market:
+                        markets.append(market)
+
+                if len(items) < PAGE_SIZE:
+                    done = True
+                    break
+            offset += PAGE_SIZE * PAGE_CONCURRENCY
 
         logger.info(f"[TMC] Found {len(markets)} upcoming crypto markets")
         return markets
 
-    def _parse_crypto_market(
-        self, m: dict, now: datetime
-    ) -> CryptoMarket | None:
-        question = m.get("question", "")
+    def _fetch_page(self, offset: int) -> list | None:
+        """Fetch one page of active Gamma markets (None on error)."""
+        params: dict[str, Any] = {
+            "limit": PAGE_SIZE,
+            "offset": offset,
+            "active": "true",
+            "closed": "false",
+        }
 
-        # Must match a crypto asset
-        asset = self._extract_asset(question)
-        if not asset or asset not in self._allowed_assets:
+        try:
+            resp = self._session.get(
+                f"{GAMMA_API_URL}/markets", params=params, timeout=15
+            )
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"[TMC] Gamma API error: {e}")
             return None
 
-        # Must be a 15-minute window market (e.g. "11:15AM-11:30AM")
-        if not FIFTEEN_MIN_WINDOW_PATTERN.search(question):
+        try:
+            items = orjson.loads(resp.content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"[TMC] Gamma API bad JSON: {e}")
             return None
+        return items if isinstance(items, list) else None
 
-        # Parse token IDs
-        raw_tokens = m.get("clobTokenIds")
-        if not raw_tokens:
-            return None
-        if isinstance(raw_tokens, str):
-            try:
-                tokens = json.loads(raw_tokens)
-            except json.JSONDecodeError:
-                return None
-        else:
-            tokens = raw_tokens
-        if not isinstance(tokens, list) or len(tokens) != 2:
+    def _parse_crypto_market(
+        self, m: dict, now: datetime, end_bounds: tuple[str, str]
+    ) -> CryptoMarket | None:
+        # Filters run cheapest/most selective first; regexes and token
+        # decoding only see markets ending in the next 1-20 minutes
+        if not m.get("active", True):
             return None
 
         # Parse end date, must be 1-20 minutes from now
-        raw_end = m.get("endDate", m.get("end_date_iso", ""))
-        if not raw_end:
+        raw_end = m.get("endDate") or m.get("end_date_iso")
+        # Anything but a string (null, a number) is unparseable: skip the
+        # market rather than fail the pass in the string pre-filter below
+        if not raw_end or not isinstance(raw_end, str):
+            return None
+        # Gamma end dates are UTC ISO strings ("...Z"), which order
+        # lexicographically: reject out-of-window markets before parsing
+        if raw_end[-1:] == "Z" and not (
+            end_bounds[0] <= raw_end[:19] <= end_bounds[1]
+        ):
             return None
         try:
             end_date = datetime.fromisoformat(raw_end.replace("Z", "+00:00"))
@@ -117,11 +175,42 @@ class CryptoMarketFinder:
         if seconds_until_end < 60 or seconds_until_end > 1200:
             return None
 
-        if not m.get("active", True):
+        raw_tokens = m.get("clobTokenIds")
+        if not raw_tokens:
+            return None
+
+        question = m.get("question", "")
+
+        # Substring prefilter: rejects most non-crypto markets without a regex
+        qu = question.upper()
+        if not any(k in qu for k in self._keywords):
+            return None
+        if "-" not in qu or ("AM" not in qu and "PM" not in qu):
+            return None
+
+        # Must match a crypto asset
+        asset = _extract_asset(self._asset_pattern, question)
+        if not asset:
+            return None
+
+        # Must be a 15-minute window market (e.g. "11:15AM-11:30AM")
+        window = FIFTEEN_MIN_WINDOW_PATTERN.search(question)
+        if not window:
+            return None
+
+        # Parse token IDs
+        if isinstance(raw_tokens, str):
+            try:
+                tokens = orjson.loads(raw_tokens)
+            except orjson.JSONDecodeError:
+                return None
+        else:
+            tokens = raw_tokens
+        if not isinstance(tokens, list) or len(tokens) != 2:
             return None
 
         # Parse start time from question (e.g. "2:00PM" from "2:00PM-2:15PM")
-        start_date = self._parse_start_time(question, end_date)
+        start_date = _parse_start_time(window.group(1).strip(), end_date)
 
         return CryptoMarket(
             condition_id=m.get("conditionId", m.get("id", "")),
@@ -134,32 +223,28 @@ class CryptoMarketFinder:
             start_date=start_date,
         )
 
-    def _extract_asset(self, question: str) -> str | None:
-        for asset, pattern in ASSET_PATTERNS.items():
-            if pattern.search(question):
-                return asset
-        return None
 
-    @staticmethod
-    def _parse_start_time(question: str, end_date: datetime) -> datetime | None:
-        """Parse start time from question text like '2:00PM-2:15PM'.
+# Gamma returns the same markets on every poll, so question parsing is memoized
+@lru_cache(maxsize=4096)
+def _extract_asset(pattern: re.Pattern, question: str) -> str | None:
+    match = pattern.search(question)
+    return match.lastgroup if match else None
 
-        Uses end_date's date and assumes ET (US/Eastern) timezone,
-        then converts to UTC.
-        """
-        match = FIFTEEN_MIN_WINDOW_PATTERN.search(question)
-        if not match:
-            return None
 
-        start_str = match.group(1).strip()  # e.g. "2:00PM"
-        try:
-            et = ZoneInfo("America/New_York")
-            # Parse "2:00PM" into hour/minute
-            t = datetime.strptime(start_str, "%I:%M%p")
-            # Combine with end_date's date in ET, then convert to UTC
-            start_et = end_date.astimezone(et).replace(
-                hour=t.hour, minute=t.minute, second=0, microsecond=0
-            )
-            return start_et.astimezone(timezone.utc)
-        except (ValueError, AttributeError):
-            return None
+@lru_cache(maxsize=4096)
+def _parse_start_time(start_str: str, end_date: datetime) -> datetime | None:
+    """Parse a window start like '2:00PM' on end_date's day.
+
+    Uses end_date's date and assumes ET (US/Eastern) timezone,
+    then converts to UTC.
+    """
+    try:
+        # Parse "2:00PM" into hour/minute
+        t = datetime.strptime(start_str, "%I:%M%p")
+        # Combine with end_date's date in ET, then convert to UTC
+        start_et = end_date.astimezone(ET).replace(
+            hour=t.hour, minute=t.minute, second=0, microsecond=0
+        )
+        return start_et.astimezone(timezone.utc)
+    except (ValueError, AttributeError):
+        return None
@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class CryptoMarket:
     condition_id: str
     question: str
@@ -13,23 +13,32 @@ class CryptoMarket:
     liquidity: float = 0.0
     start_date: datetime | None = None  # When the 15-min window opens
     strike_price: float | None = None  # Chainlink price captured at start_date
+    # Cached per-market constants (derived, not passed in)
+    end_ts: float = field(init=False, repr=False)  # end_date as epoch seconds
+    start_ts: float | None = field(init=False, repr=False, default=None)
+    decimals: int = field(init=False, repr=False, default=2)  # price rounding
+    label: str = field(init=False, repr=False, default="")  # question for logs
 
+    def __post_init__(self) -> None:
+        self.end_ts = self.end_date.timestamp()
+        self.label = self.question[:50]
+        if self.start_date is not None:
+            self.start_ts = self.start_date.timestamp()
+        if self.strike_price is not None:
+            self.set_strike(self.strike_price)
 
-@dataclass
-class OddsSnapshot:
-    timestamp: float  # time.time()
-    yes_price: float
-    no_price: float
+    def set_strike(self, price: float) -> None:
+        """Record the strike and the price precision derived from its magnitude."""
+        self.strike_price = price
+        self.decimals = 6 if price < 10 else (4 if price < 1000 else 2)
 
-    @property
-    def spread(self) -> float:
-        return abs(self.yes_price - 0.5)
 
-
-@dataclass
+@dataclass(slots=True)
 class TightnessProfile:
+    """Aggregates of a market's odds snapshots (history: get_history)."""
+
     market: CryptoMarket
-    snapshots: list[OddsSnapshot]
+    snapshot_count: int
     tight_ratio: float  # fraction of snapshots within threshold
     avg_spread: float
     current_yes: float
@@ -37,7 +46,7 @@ class TightnessProfile:
     seconds_remaining: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TightMarketOpportunity:
     market: CryptoMarket
     profile: TightnessProfile
@@ -58,7 +67,7 @@ class TightMarketOpportunity:
     timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
-@dataclass
+@dataclass(slots=True)
 class TightMarketTradeResult:
     opportunity: TightMarketOpportunity
     success: bool
@@ -1,7 +1,12 @@
 import logging
 import math
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+import numpy as np
+
 from src.core.client import PolymarketClient
 from src.core.config import Config
 
@@ -11,30 +16,25 @@ from .tightness_tracker import TightnessTracker
 
 logger = logging.getLogger("polyagent")
 
+FIRED_MAX = 4096  # fired condition_ids remembered at most
+# Skip logs outlive their market by this long before being swept; the
+# coordinator normally collects them (mark_expired) seconds after expiry
+SKIP_LOG_TTL = 3600.0
+SKIP_SWEEP_INTERVAL = 60.0
+SIDES = ("YES", "NO")  # bet side labels by side index
+# Model probabilities are capped to this range to avoid overconfident extremes
+MODEL_PROB_MIN = 0.10
+MODEL_PROB_MAX = 0.90
+
+INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
 
 # ── Black-Scholes helpers ────────────────────────────────────────────────────
 
 
 def norm_cdf(x: float) -> float:
-    """Standard normal CDF via Abramowitz & Stegun approximation."""
-    if x < -8:
-        return 0.0
-    if x > 8:
-        return 1.0
-    a1, a2, a3, a4, a5 = (
-        0.254829592,
-        -0.284496736,
-        1.421413741,
-        -1.453152027,
-        1.061405429,
-    )
-    p = 0.3275911
-    sign = 1 if x >= 0 else -1
-    t = 1.0 / (1.0 + p * abs(x))
-    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(
-        -x * x / 2.0
-    )
-    return 0.5 * (1.0 + sign * y)
+    """Standard normal CDF via the C-level math.erf (exact to double precision)."""
+    return 0.5 * (1.0 + math.erf(x * INV_SQRT2))
 
 
 def calc_prob_above(price: float, strike: float, vol: float, T: float) -> float:
@@ -51,14 +51,120 @@ def calc_prob_above(price: float, strike: float, vol: float, T: float) -> float:
     """
     if price <= 0 or strike <= 0 or vol <= 0 or T <= 0:
         return 0.5  # degenerate — no information
-    denom = vol * math.sqrt(T)
+    # σ²T is shared by the drift term and the denominator σ√T = √(σ²T)
+    var_t = vol * vol * T
+    denom = math.sqrt(var_t)
     if denom < 1e-12:
         return 1.0 if price > strike else 0.0
     # Full d₂ with drift term: d₂ = [ln(S/K) - ½σ²T] / (σ√T)
-    d2 = (math.log(price / strike) - 0.5 * vol * vol * T) / denom
+    d2 = (math.log(price / strike) - 0.5 * var_t) / denom
     return norm_cdf(d2)
 
 
+# ── Skip log ─────────────────────────────────────────────────────────────────
+
+# Skip record fields, in shadow-log key order
+SKIP_FIELDS = (
+    "timestamp", "remaining", "in_execution_window", "current_price", "strike",
+    "volatility", "model_prob", "yes_price", "no_price",
+    "market_prob", "edge", "bet_side", "skip_reason",
+)
+# Only known once the CLOB asks are in (gate 4 onwards); omitted when unset
+OPTIONAL_SKIP_FIELDS = frozenset(("market_prob", "edge", "bet_side"))
+
+
+# Numeric skip fields, stored as float64 columns (NaN = unset)
+SKIP_NUMERIC_FIELDS = (
+    "timestamp", "remaining", "current_price", "strike", "volatility",
+    "model_prob", "yes_price", "no_price", "market_prob", "edge",
+)
+SKIP_LOG_CAPACITY = 64  # initial rows per market; doubles when full
+SKIP_LOG_MAX_ROWS = 1024  # growth stops here; the older half is dropped instead
+
+
+@dataclass(slots=True)
+class _SkipLog:
+    """Raw skip records for one market, stored column-wise.
+
+    Numeric fields go into one float64 array (a row per skip) that doubles
+    when full, up to SKIP_LOG_MAX_ROWS; past that the oldest half of the
+    records is discarded, so a market's log stays bounded however long it
+    skips. Rounding (vectorized per column) and dict building happen once,
+    when the shadow entry is written.
+    """
+
+    # Market constants, taken from the first record's context
+    decimals: int = 2
+    end_ts: float = math.inf  # market end, for the TTL sweep
+    n: int = 0
+    values: np.ndarray = field(
+        default_factory=lambda: np.empty((SKIP_LOG_CAPACITY, len(SKIP_NUMERIC_FIELDS)))
+    )
+    in_execution_window: list[bool] = field(default_factory=list)
+    bet_side: list[str | None] = field(default_factory=list)
+    skip_reason: list[str] = field(default_factory=list)
+
+    def append(self, ctx: dict, skip_reason: str) -> None:
+        if not self.n:
+            self.decimals = ctx["decimals"]
+            self.end_ts = ctx["end_ts"]
+        elif self.n == len(self.values):
+            if self.n < SKIP_LOG_MAX_ROWS:
+                self.values = np.concatenate((self.values, np.empty_like(self.values)))
+            else:
+                self._drop_oldest(self.n - self.n // 2)
+        # None becomes NaN on assignment
+        self.values[self.n] = [ctx.get(f) for f in SKIP_NUMERIC_FIELDS]
+        self.n += 1
+        self.in_execution_window.append(ctx.get("in_execution_window"))
+        self.bet_side.append(ctx.get("bet_side"))
+        self.skip_reason.append(skip_reason)
+
+    def _drop_oldest(self, count: int) -> None:
+        keep = self.n - count
+        self.values[:keep] = self.values[count : self.n]
+        self.n = keep
+        del self.in_execution_window[:count]
+        del self.bet_side[:count]
+        del self.skip_reason[:count]
+
+    def to_dicts(self) -> list[dict]:
+        c = dict(zip(SKIP_NUMERIC_FIELDS, self.values[: self.n].T))
+        d = self.decimals
+
+        def r(values: np.ndarray, ndigits: int) -> list:
+            # One vectorized rounding per column, like the shadow trails
+            return [v if v == v else None for v in values.round(ndigits).tolist()]
+
+        timestamps = [
+            datetime.fromtimestamp(t, timezone.utc).isoformat()
+            for t in c["timestamp"].tolist()
+        ]
+        rows = zip(
+            timestamps,
+            r(c["remaining"], 1),
+            self.in_execution_window,
+            r(c["current_price"], d),
+            r(c["strike"], d),
+            r(c["volatility"], 8),
+            r(c["model_prob"], 4),
+            r(c["yes_price"], 4),
+            r(c["no_price"], 4),
+            r(c["market_prob"], 4),
+            r(c["edge"], 4),
+            self.bet_side,
+            self.skip_reason,
+        )
+        return [
+            {
+                k: v
+                for k, v in zip(SKIP_FIELDS, row)
+                if v is not None or k not in OPTIONAL_SKIP_FIELDS
+            }
+            for row in rows
+        ]
+
+
 # ── Signal Engine ────────────────────────────────────────────────────────────
 
 
@@ -74,8 +180,12 @@ class SignalEngine:
         self.tracker = tracker
         self.client = client
         self.price_feed = price_feed
-        self._fired: set[str] = set()  # condition_ids already fired
-        self._skipped_signals: dict[str, list[dict]] = {}  # cid -> list of skip entries
+        # condition_id -> market end_ts for signals already fired, oldest first;
+        # bounded and self-pruning so it never outgrows the live markets
+        self._fired: OrderedDict[str, float] = OrderedDict()
+        # cid -> skip records; a market's log is created by its first skip
+        self._skipped_signals: defaultdict[str, _SkipLog] = defaultdict(_SkipLog)
+        self._next_skip_sweep = 0.0
 
     def check_signals(self) -> list[TightMarketOpportunity]:
         """Evaluate all tracked markets using Black-Scholes N(d₂) pricing.
@@ -84,157 +194,226 @@ class SignalEngine:
         says the market underprices it (edge = model_prob - market_prob > min_edge).
         """
         opportunities: list[TightMarketOpportunity] = []
-        profiles = self.tracker.get_all_profiles()
-
-        for profile in profiles:
-            cid = profile.market.condition_id
-            asset = profile.market.asset
-            q = profile.market.question[:50]
-            remaining = profile.seconds_remaining
-
-            if cid in self._fired:
-                continue
-
-            if profile.market.strike_price is None:
-                continue
-
-            if remaining <= 0 or remaining > self.config.tmc_entry_window:
-                continue
-
-            if remaining < self.config.tmc_min_seconds_remaining:
-                continue
-
-            # Get live crypto price and volatility from Chainlink
-            current_price = self.price_feed.get_price(asset)
-            volatility = self.price_feed.get_volatility(
-                asset, self.config.tmc_volatility_window
+        candidates: list[tuple] = []  # markets past gates 1-2, awaiting asks
+        # One clock read per pass: time remaining, fired pruning and skip
+        # records all see the same instant
+        now = time.time()
+        self._prune_fired(now)
+        if now >= self._next_skip_sweep:
+            self._sweep_skip_logs(now)
+
+        # Loop-invariant config, read once per pass
+        cfg = self.config
+        entry_window = cfg.tmc_entry_window
+        min_seconds = cfg.tmc_min_seconds_remaining
+        exec_window = cfg.tmc_execution_window
+        vol_window = cfg.tmc_volatility_window
+        min_ask = cfg.tmc_min_ask
+        amount = cfg.tmc_max_investment
+        fired = self._fired
+        log_info = logger.info
+        log_enabled = logger.isEnabledFor(logging.INFO)
+
+        # Only markets between min_seconds and the entry window can produce
+        # anything this pass; the tracker skips the rest before building a
+        # profile for them
+        profiles = self.tracker.get_all_profiles(
+            now, min_remaining=min_seconds, max_remaining=entry_window
+        )
+
+        # Cheap attribute gates first: only markets inside the entry window
+        # (bounded by the tracker above), with a strike and not yet fired,
+        # reach the price feed. Outside the execution window a market only
+        # feeds the periodic WATCH log, so on every other tick it is dropped
+        # here before any feed or model work
+        in_window = [
+            p for p in profiles
+            if p.seconds_remaining > 0
+            and p.market.strike_price is not None
+            and p.market.condition_id not in fired
+            and (
+                p.seconds_remaining <= exec_window
+                or (log_enabled and p.seconds_remaining % 5 < 0.6)
             )
-
+        ]
+
+        feed_cache: dict[str, tuple[float | None, float | None]] = {}
+        limits: dict[str, tuple[float, float]] = {}  # asset -> (min_vol, min_edge)
+        price_feed = self.price_feed
+        record_skip = self._record_skip
+        prob_above = calc_prob_above
+        for profile in in_window:
+            asset = profile.market.asset
+            # Live crypto price and volatility from Chainlink, once per asset
+            # per pass (markets on the same asset share them)
+            feed = feed_cache.get(asset)
+            if feed is None:
+                feed = feed_cache[asset] = price_feed.get_price_and_volatility(
+                    asset, vol_window, now
+                )
+            current_price, volatility = feed
             if current_price is None:
                 continue
 
+            cid = profile.market.condition_id
+            remaining = profile.seconds_remaining
             strike = profile.market.strike_price
-            in_exec = remaining <= self.config.tmc_execution_window
+            in_exec = remaining <= exec_window
 
-            # Compute model probability (capped to avoid overconfident extremes)
+            # Model probability, only meaningful with a positive volatility;
+            # capped once here, and every gate and skip record reuses the
+            # capped value
             if volatility is not None and volatility > 0:
-                raw_prob = calc_prob_above(current_price, strike, volatility, remaining)
-                model_prob = max(0.10, min(0.90, raw_prob))
+                p = prob_above(current_price, strike, volatility, remaining)
+                model_prob = min(max(p, MODEL_PROB_MIN), MODEL_PROB_MAX)
             else:
                 model_prob = None
 
+            # Must be in execution window to fire
+            if not in_exec:
+                log_info(
+                    f"[TMC] WATCH {asset} '{profile.market.label}' | "
+                    f"price=${current_price:,.2f} strike=${strike:,.2f} | "
+                    f"model_prob={model_prob:.3f} | "
+                    f"remaining={remaining:.0f}s"
+                    if model_prob is not None
+                    else f"[TMC] WATCH {asset} '{profile.market.label}' | "
+                    f"price=${current_price:,.2f} strike=${strike:,.2f} | "
+                    f"remaining={remaining:.0f}s"
+                )
+                continue
+
             # Build reusable context for skip recording
             ctx = self._build_context(
-                cid, remaining, current_price, strike,
+                now, cid, remaining, current_price, strike,
                 volatility, model_prob, profile, in_exec,
             )
 
-            # Must be in execution window to fire
-            if not in_exec:
-                if remaining % 5 < 0.6:
-                    logger.info(
-                        f"[TMC] WATCH {asset} '{q}' | "
-                        f"price=${current_price:,.2f} strike=${strike:,.2f} | "
-                        f"model_prob={model_prob:.3f} | "
-                        f"remaining={remaining:.0f}s"
-                        if model_prob is not None
-                        else f"[TMC] WATCH {asset} '{q}' | "
-                        f"price=${current_price:,.2f} strike=${strike:,.2f} | "
-                        f"remaining={remaining:.0f}s"
-                    )
-                continue
-
             # === BLACK-SCHOLES ENTRY GATES ===
 
             # Gate 1: Need valid volatility
-            min_vol = self.config.get_tmc_min_volatility(asset)
-            if volatility is None or volatility < min_vol:
-                self._record_skip(ctx, skip_reason="low_volatility")
-                logger.info(
-                    f"[TMC] SKIP {asset} '{q}' | "
-                    f"vol={volatility} < min {min_vol} | "
-                    f"remaining={remaining:.0f}s"
+            # Per-asset thresholds (env overrides), resolved once per pass
+            lim = limits.get(asset)
+            if lim is None:
+                lim = limits[asset] = (
+                    cfg.get_tmc_min_volatility(asset),
+                    cfg.get_tmc_min_edge(asset),
                 )
+            min_vol = lim[0]
+            if volatility is None or volatility < min_vol:
+                record_skip(ctx, skip_reason="low_volatility")
+                if log_enabled:
+                    log_info(
+                        f"[TMC] SKIP {asset} '{profile.market.label}' | "
+                        f"vol={volatility} < min {min_vol} | "
+                        f"remaining={remaining:.0f}s"
+                    )
                 continue
 
             # Gate 2: Need valid model probability
             if model_prob is None:
-                self._record_skip(ctx, skip_reason="no_model_prob")
+                record_skip(ctx, skip_reason="no_model_prob")
                 continue
 
+            candidates.append((
+                profile, ctx, remaining, current_price, strike, volatility, model_prob
+            ))
+
+        if not candidates:
+            return opportunities
+
+        fired_at: str | None = None  # ISO timestamp of this pass, on first fire
+
+        # Live CLOB asks for every candidate, fetched in one bulk request
+        asks = self.client.get_best_asks(
+            [t for c in candidates for t in c[0].market.token_ids[:2]]
+        )
+
+        for (
+            profile, ctx, remaining, current_price, strike, volatility, model_prob
+        ) in candidates:
+            cid = profile.market.condition_id
+            asset = profile.market.asset
+
             # Gate 3: Live CLOB asks — need valid prices
             token_ids = profile.market.token_ids
-            yes_ask = self.client.get_best_ask(token_ids[0])
-            no_ask = self.client.get_best_ask(token_ids[1])
+            yes_ask = asks.get(token_ids[0])
+            no_ask = asks.get(token_ids[1])
 
             if yes_ask is None or no_ask is None or yes_ask <= 0 or no_ask <= 0:
-                self._record_skip(ctx, skip_reason="no_valid_asks")
-                logger.info(
-                    f"[TMC] SKIP {asset} '{q}' | "
-                    f"no valid asks (YES={yes_ask} NO={no_ask})"
-                )
+                record_skip(ctx, skip_reason="no_valid_asks")
+                if log_enabled:
+                    log_info(
+                        f"[TMC] SKIP {asset} '{profile.market.label}' | "
+                        f"no valid asks (YES={yes_ask} NO={no_ask})"
+                    )
                 continue
 
             # Gate 4: Determine best side and edge
             edge_yes = model_prob - yes_ask
             edge_no = (1 - model_prob) - no_ask
 
-            if edge_yes >= edge_no:
-                bet_side = "YES"
-                bet_ask = yes_ask
-                bet_token_id = token_ids[0]
-                edge = edge_yes
-                market_prob = yes_ask
-            else:
-                bet_side = "NO"
-                bet_ask = no_ask
-                bet_token_id = token_ids[1]
-                edge = edge_no
-                market_prob = no_ask
+            # Side index: 0 = YES, 1 = NO (ties go to YES)
+            side = int(edge_no > edge_yes)
+            bet_side = SIDES[side]
+            bet_ask = (yes_ask, no_ask)[side]
+            bet_token_id = token_ids[side]
+            edge = (edge_yes, edge_no)[side]
+            market_prob = bet_ask
 
             # Update context with computed values
-            ctx["model_prob"] = round(model_prob, 4)
-            ctx["market_prob"] = round(market_prob, 4)
-            ctx["edge"] = round(edge, 4)
+            ctx["market_prob"] = market_prob
+            ctx["edge"] = edge
             ctx["bet_side"] = bet_side
 
-            # Gate 5: Must bet on the FAVORITE (majority) side
-            favorite_side = "YES" if model_prob > 0.5 else "NO"
-            if bet_side != favorite_side:
-                self._record_skip(ctx, skip_reason="not_favorite_side")
-                logger.info(
-                    f"[TMC] SKIP {asset} '{q}' | "
-                    f"bet_side={bet_side} != favorite={favorite_side} | "
-                    f"model_prob={model_prob:.3f} | "
-                    f"remaining={remaining:.0f}s"
-                )
+            # Gate 5: Must bet on the FAVORITE (majority) side; compared as
+            # side indices, the label is only spelled out for the log
+            favorite = int(model_prob <= 0.5)
+            if side != favorite:
+                record_skip(ctx, skip_reason="not_favorite_side")
+                if log_enabled:
+                    log_info(
+                        f"[TMC] SKIP {asset} '{profile.market.label}' | "
+                        f"bet_side={bet_side} != favorite={SIDES[favorite]} | "
+                        f"model_prob={model_prob:.3f} | "
+                        f"remaining={remaining:.0f}s"
+                    )
                 continue
 
             # Gate 6: Minimum edge threshold
-            min_edge = self.config.get_tmc_min_edge(asset)
+            min_edge = limits[asset][1]
             if edge < min_edge:
-                self._record_skip(ctx, skip_reason="edge_too_low")
-                logger.info(
-                    f"[TMC] SKIP {asset} '{q}' | "
-                    f"edge={edge:.3f} < min {min_edge} | "
-                    f"model_prob={model_prob:.3f} market={market_prob:.3f} | "
-                    f"remaining={remaining:.0f}s"
-                )
+                record_skip(ctx, skip_reason="edge_too_low")
+                if log_enabled:
+                    log_info(
+                        f"[TMC] SKIP {asset} '{profile.market.label}' | "
+                        f"edge={edge:.3f} < min {min_edge} | "
+                        f"model_prob={model_prob:.3f} market={market_prob:.3f} | "
+                        f"remaining={remaining:.0f}s"
+                    )
                 continue
 
             # Gate 7: Minimum ask to avoid illiquid extremes
-            if bet_ask < self.config.tmc_min_ask:
-                self._record_skip(ctx, skip_reason="ask_too_low")
-                logger.info(
-                    f"[TMC] SKIP {asset} '{q}' | "
-                    f"ask={bet_ask:.3f} < min {self.config.tmc_min_ask} | "
-                    f"remaining={remaining:.0f}s"
-                )
+            if bet_ask < min_ask:
+                record_skip(ctx, skip_reason="ask_too_low")
+                if log_enabled:
+                    log_info(
+                        f"[TMC] SKIP {asset} '{profile.market.label}' | "
+                        f"ask={bet_ask:.3f} < min {min_ask} | "
+                        f"remaining={remaining:.0f}s"
+                    )
                 continue
 
             # === FIRE SIGNAL ===
-            amount = self.config.tmc_max_investment
             payout_ratio = 1.0 / bet_ask if bet_ask > 0 else 0
+            # Signals of one pass share its instant, formatted once (UTC, naive
+            # like the model's default)
+            if fired_at is None:
+                fired_at = (
+                    datetime.fromtimestamp(now, timezone.utc)
+                    .replace(tzinfo=None)
+                    .isoformat()
+                )
 
             opp = TightMarketOpportunity(
                 market=profile.market,
@@ -252,35 +431,64 @@ class SignalEngine:
                 market_prob=market_prob,
                 edge=edge,
                 volatility=volatility,
+                timestamp=fired_at,
             )
             opportunities.append(opp)
-            self._fired.add(cid)
-
-            logger.info(
-                f"[TMC] >>> SIGNAL FIRED: {asset} '{q}' | "
-                f"BUY {bet_side}@${bet_ask:.3f} ${amount:.2f} "
-                f"(payout={payout_ratio:.1f}x) | "
-                f"model_prob={model_prob:.3f} market={market_prob:.3f} "
-                f"edge={edge:.3f} | "
-                f"YES=${yes_ask:.3f} NO=${no_ask:.3f} | "
-                f"price=${current_price:,.2f} strike=${strike:,.2f} "
-                f"vol={volatility:.6f} | "
-                f"remaining={remaining:.0f}s"
-            )
+            self._mark_fired(cid, profile.market.end_ts)
+
+            if log_enabled:
+                log_info(
+                    f"[TMC] >>> SIGNAL FIRED: {asset} '{profile.market.label}' | "
+                    f"BUY {bet_side}@${bet_ask:.3f} ${amount:.2f} "
+                    f"(payout={payout_ratio:.1f}x) | "
+                    f"model_prob={model_prob:.3f} market={market_prob:.3f} "
+                    f"edge={edge:.3f} | "
+                    f"YES=${yes_ask:.3f} NO=${no_ask:.3f} | "
+                    f"price=${current_price:,.2f} strike=${strike:,.2f} "
+                    f"vol={volatility:.6f} | "
+                    f"remaining={remaining:.0f}s"
+                )
 
         return opportunities
 
     # --- Helpers ---
 
     def get_skipped_signals(self, condition_id: str) -> list[dict]:
-        return self._skipped_signals.get(condition_id, [])
+        log = self._skipped_signals.get(condition_id)
+        return log.to_dicts() if log else []
 
     def mark_expired(self, condition_id: str) -> None:
-        self._fired.discard(condition_id)
+        self._fired.pop(condition_id, None)
         self._skipped_signals.pop(condition_id, None)
 
+    def _mark_fired(self, condition_id: str, end_ts: float) -> None:
+        self._fired[condition_id] = end_ts
+        self._fired.move_to_end(condition_id)
+        while len(self._fired) > FIRED_MAX:
+            self._fired.popitem(last=False)
+
+    def _prune_fired(self, now: float) -> None:
+        """Drop fired entries whose market has ended (oldest first)."""
+        while self._fired:
+            cid, end_ts = next(iter(self._fired.items()))
+            if end_ts >= now:
+                break
+            del self._fired[cid]
+
+    def _sweep_skip_logs(self, now: float) -> None:
+        """Drop skip logs of markets that ended over SKIP_LOG_TTL ago.
+
+        Backstop for markets whose mark_expired call never came.
+        """
+        self._next_skip_sweep = now + SKIP_SWEEP_INTERVAL
+        cutoff = now - SKIP_LOG_TTL
+        stale = [c for c, log in self._skipped_signals.items() if log.end_ts < cutoff]
+        for cid in stale:
+            del self._skipped_signals[cid]
+
     def _build_context(
         self,
+        now: float,
         cid: str,
         remaining: float,
         current_price: float,
@@ -290,18 +498,20 @@ class SignalEngine:
         profile,
         in_execution_window: bool,
     ) -> dict:
-        """Build a reusable context dict for skip recording."""
-        decimals = 6 if strike < 10 else (4 if strike < 1000 else 2)
+        """Build a reusable context dict for skip recording (raw, unrounded)."""
         return {
+            "timestamp": now,
             "cid": cid,
-            "remaining": round(remaining, 1),
+            "decimals": profile.market.decimals,
+            "end_ts": profile.market.end_ts,
+            "remaining": remaining,
             "in_execution_window": in_execution_window,
-            "current_price": round(current_price, decimals),
-            "strike": round(strike, decimals),
-            "volatility": round(volatility, 8) if volatility is not None else None,
-            "model_prob": round(model_prob, 4) if model_prob is not None else None,
-            "yes_price": round(profile.current_yes, 4),
-            "no_price": round(profile.current_no, 4),
+            "current_price": current_price,
+            "strike": strike,
+            "volatility": volatility,
+            "model_prob": model_prob,
+            "yes_price": profile.current_yes,
+            "no_price": profile.current_no,
         }
 
     def _record_skip(
@@ -309,12 +519,4 @@ class SignalEngine:
         ctx: dict,
         skip_reason: str = "",
     ) -> None:
-        entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            **{k: v for k, v in ctx.items() if k != "cid"},
-            "skip_reason": skip_reason,
-        }
-        cid = ctx["cid"]
-        if cid not in self._skipped_signals:
-            self._skipped_signals[cid] = []
-        self._skipped_signals[cid].append(entry)
+        self._skipped_signals[ctx["cid"]].append(ctx, skip_reason)
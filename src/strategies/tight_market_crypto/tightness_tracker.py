@@ -1,50 +1,110 @@
-import json
 import logging
+import math
 import threading
 import time
-from datetime import datetime, timezone
+from collections.abc import Iterable
 
+import numpy as np
+import orjson
 import websocket
 
 from src.core.config import Config
 
-from .models import CryptoMarket, OddsSnapshot, TightnessProfile
+from .models import CryptoMarket, TightnessProfile
 
 logger = logging.getLogger("polyagent")
 
 WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+# Initial per-market snapshot capacity; doubles when full
+SNAPSHOT_CAPACITY = 1024
+# Growth stops here; the older half of the history is dropped instead
+# (aggregates still cover every snapshot)
+SNAPSHOT_MAX_ROWS = 8192
+
+
+def _grow(a: np.ndarray) -> np.ndarray:
+    out = np.empty(2 * len(a), dtype=a.dtype)
+    out[: len(a)] = a
+    return out
+
+
+def _newest_half(a: np.ndarray) -> np.ndarray:
+    out = np.empty_like(a)
+    half = len(a) // 2
+    out[:half] = a[len(a) - half :]
+    return out
 
 
 class MarketTracker:
-    """Tracks odds snapshots for a single market."""
+    """Tracks odds snapshots for a single market.
+
+    Snapshots are stored as parallel float64 arrays that grow by doubling,
+    up to SNAPSHOT_MAX_ROWS; past that the newest half moves into fresh
+    arrays, so memory stays bounded however long a market is tracked. Entries
+    below the write head are never modified, so get_history hands out views
+    instead of copies. Profiles carry only aggregates (count, tight count
+    and spread sum are kept running over every snapshot), so a profile
+    costs O(1) regardless of history length.
+    """
 
     def __init__(self, market: CryptoMarket, tightness_threshold: float):
         self.market = market
         self._threshold = tightness_threshold
-        self._snapshots: list[OddsSnapshot] = []
+        self._ts = np.empty(SNAPSHOT_CAPACITY, dtype=np.float64)
+        self._yes = np.empty(SNAPSHOT_CAPACITY, dtype=np.float64)
+        self._no = np.empty(SNAPSHOT_CAPACITY, dtype=np.float64)
+        self._n = 0  # rows held
+        self._count = 0  # snapshots recorded
+        self._tight_count = 0
+        self._spread_sum = 0.0
         self._lock = threading.Lock()
 
-    def record(self, yes_price: float, no_price: float) -> None:
-        snap = OddsSnapshot(
-            timestamp=time.time(),
-            yes_price=yes_price,
-            no_price=no_price,
-        )
+    def record(
+        self, yes_price: float, no_price: float, now: float | None = None
+    ) -> None:
+        if now is None:
+            now = time.time()
+        spread = math.fabs(yes_price - 0.5)
         with self._lock:
-            self._snapshots.append(snap)
-
-    def get_profile(self) -> TightnessProfile:
-        now = time.time()
-        end_ts = self.market.end_date.timestamp()
-        seconds_remaining = max(0.0, end_ts - now)
+            n = self._n
+            if n == len(self._ts):
+                # Move into fresh arrays; views handed out keep the old ones
+                if n < SNAPSHOT_MAX_ROWS:
+                    self._ts = _grow(self._ts)
+                    self._yes = _grow(self._yes)
+                    self._no = _grow(self._no)
+                else:
+                    self._ts = _newest_half(self._ts)
+                    self._yes = _newest_half(self._yes)
+                    self._no = _newest_half(self._no)
+                    n //= 2
+            self._ts[n] = now
+            self._yes[n] = yes_price
+            self._no[n] = no_price
+            self._n = n + 1
+            self._count += 1
+            self._spread_sum += spread
+            if spread <= self._threshold:
+                self._tight_count += 1
+
+    def get_profile(self, now: float | None = None) -> TightnessProfile:
+        if now is None:
+            now = time.time()
+        seconds_remaining = max(0.0, self.market.end_ts - now)
 
         with self._lock:
-            snapshots = list(self._snapshots)
-
-        if not snapshots:
+            n = self._n
+            count = self._count
+            tight_count = self._tight_count
+            spread_sum = self._spread_sum
+            if n:
+                current_yes = float(self._yes[n - 1])
+                current_no = float(self._no[n - 1])
+
+        if not n:
             return TightnessProfile(
                 market=self.market,
-                snapshots=[],
+                snapshot_count=0,
                 tight_ratio=0.0,
                 avg_spread=1.0,
                 current_yes=0.5,
@@ -52,35 +112,47 @@ class MarketTracker:
                 seconds_remaining=seconds_remaining,
             )
 
-        tight_count = sum(1 for s in snapshots if s.spread <= self._threshold)
-        tight_ratio = tight_count / len(snapshots)
-        avg_spread = sum(s.spread for s in snapshots) / len(snapshots)
-        latest = snapshots[-1]
-
         return TightnessProfile(
             market=self.market,
-            snapshots=snapshots,
-            tight_ratio=tight_ratio,
-            avg_spread=avg_spread,
-            current_yes=latest.yes_price,
-            current_no=latest.no_price,
+            snapshot_count=count,
+            tight_ratio=tight_count / count,
+            avg_spread=spread_sum / count,
+            current_yes=current_yes,
+            current_no=current_no,
             seconds_remaining=seconds_remaining,
         )
 
+    def get_history(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(timestamps, yes, no) of the held snapshots in time order, as views."""
+        with self._lock:
+            n = self._n
+            return self._ts[:n], self._yes[:n], self._no[:n]
+
 
 class TightnessTracker:
     """Manages WebSocket tracking for multiple crypto markets."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, wake: threading.Event | None = None):
         self.config = config
+        # Set when a market near its execution window gets a new snapshot
+        self._wake = wake
+        self._wake_within = config.tmc_execution_window + 5  # seconds to expiry
         self._trackers: dict[str, MarketTracker] = {}  # condition_id -> tracker
-        self._token_to_market: dict[str, str] = {}  # token_id -> condition_id
+        # token_id -> (tracker, "yes"/"no", current best asks of the market);
+        # both tokens of a market share one prices dict. Copy-on-write:
+        # add/remove publish a new map under the lock, so the WS thread
+        # reads it without locking
+        self._token_lookup: dict[
+            str, tuple[MarketTracker, str, dict[str, float | None]]
+        ] = {}
         self._lock = threading.Lock()
         self._ws: websocket.WebSocketApp | None = None
         self._ws_thread: threading.Thread | None = None
         self._running = False
-        # Track current prices per condition_id
-        self._current_prices: dict[str, dict[str, float | None]] = {}
+        # Earliest end_ts among tracked markets, kept current on add/remove
+        self._next_expiry_ts = math.inf
+        # Markets that still need a strike (start_ts known, strike not captured)
+        self._pending_strike: dict[str, CryptoMarket] = {}
 
     def start(self) -> None:
         if self._running:
@@ -102,28 +174,55 @@ class TightnessTracker:
         logger.info("[TMC] TightnessTracker stopped")
 
     def add_market(self, market: CryptoMarket) -> None:
+        self.add_markets([market])
+
+    def add_markets(self, markets: Iterable[CryptoMarket]) -> int:
+        """Track several markets under one lock and a single WS resubscribe.
+
+        Returns the number of markets that were not already tracked.
+        """
+        added: list[CryptoMarket] = []
         with self._lock:
-            if market.condition_id in self._trackers:
-                return
-            tracker = MarketTracker(market, 0.10)
-            self._trackers[market.condition_id] = tracker
-            self._token_to_market[market.token_ids[0]] = market.condition_id
-            self._token_to_market[market.token_ids[1]] = market.condition_id
-            self._current_prices[market.condition_id] = {"yes": None, "no": None}
-        logger.info(
-            f"[TMC] Tracking: {market.asset} '{market.question[:50]}' "
-            f"(ends in {(market.end_date - datetime.now(timezone.utc)).total_seconds():.0f}s)"
-        )
+            lookup = dict(self._token_lookup)
+            for market in markets:
+                if market.condition_id in self._trackers:
+                    continue
+                tracker = MarketTracker(market, 0.10)
+                self._trackers[market.condition_id] = tracker
+                prices: dict[str, float | None] = {"yes": None, "no": None}
+                lookup[market.token_ids[0]] = (tracker, "yes", prices)
+                lookup[market.token_ids[1]] = (tracker, "no", prices)
+                self._next_expiry_ts = min(self._next_expiry_ts, market.end_ts)
+                if market.strike_price is None and market.start_ts is not None:
+                    self._pending_strike[market.condition_id] = market
+                added.append(market)
+            if added:
+                self._token_lookup = lookup
+        if not added:
+            return 0
+        if logger.isEnabledFor(logging.INFO):
+            now = time.time()
+            tracking = "\n".join(
+                f"  {m.asset} '{m.label}' (ends in {m.end_ts - now:.0f}s)"
+                for m in added
+            )
+            logger.info(f"[TMC] Tracking:\n{tracking}")
         self._reconnect_ws()
+        return len(added)
 
     def remove_market(self, condition_id: str) -> None:
         removed = False
         with self._lock:
             tracker = self._trackers.pop(condition_id, None)
             if tracker:
+                lookup = dict(self._token_lookup)
                 for tid in tracker.market.token_ids:
-                    self._token_to_market.pop(tid, None)
-                self._current_prices.pop(condition_id, None)
+                    lookup.pop(tid, None)
+                self._token_lookup = lookup
+                self._pending_strike.pop(condition_id, None)
+                self._next_expiry_ts = min(
+                    (t.market.end_ts for t in self._trackers.values()), default=math.inf
+                )
                 removed = True
         if removed:
             self._reconnect_ws()
@@ -135,19 +234,63 @@ class TightnessTracker:
             return None
         return tracker.get_profile()
 
-    def get_all_profiles(self) -> list[TightnessProfile]:
+    def get_history(
+        self, condition_id: str
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        with self._lock:
+            tracker = self._trackers.get(condition_id)
+        if not tracker:
+            return None
+        return tracker.get_history()
+
+    def get_all_profiles(
+        self,
+        now: float | None = None,
+        min_remaining: float = -math.inf,
+        max_remaining: float = math.inf,
+    ) -> list[TightnessProfile]:
+        """Profiles of tracked markets with min..max_remaining seconds left."""
         with self._lock:
             trackers = list(self._trackers.values())
-        return [t.get_profile() for t in trackers]
+        # One clock read for the whole batch (or the caller's)
+        if now is None:
+            now = time.time()
+        # Markets outside the bounds are skipped before any profile is built
+        lo, hi = now + min_remaining, now + max_remaining
+        return [t.get_profile(now) for t in trackers if lo <= t.market.end_ts <= hi]
+
+    def snapshot(self) -> dict[str, CryptoMarket]:
+        """condition_id -> market, copied under a single lock acquisition."""
+        with self._lock:
+            return {cid: t.market for cid, t in self._trackers.items()}
 
-    def get_tracked_market(self, condition_id: str) -> CryptoMarket | None:
+    def pending_strike_markets(self) -> list[CryptoMarket]:
+        """Tracked markets still waiting for their strike price."""
         with self._lock:
-            tracker = self._trackers.get(condition_id)
-        return tracker.market if tracker else None
+            return list(self._pending_strike.values())
 
-    def tracked_condition_ids(self) -> set[str]:
+    def set_strike(self, market: CryptoMarket, price: float) -> None:
+        """Record the strike and stop reporting the market as pending."""
+        market.set_strike(price)
         with self._lock:
-            return set(self._trackers.keys())
+            self._pending_strike.pop(market.condition_id, None)
+
+    def next_expiry_ts(self) -> float:
+        """Earliest end_ts among tracked markets (inf when nothing is tracked)."""
+        return self._next_expiry_ts
+
+    def has_actionable_markets(self) -> bool:
+        """True if any market with a strike is inside its entry window."""
+        now = time.time()
+        cutoff = now + self.config.tmc_entry_window
+        # O(1) exit for the common case: even the earliest expiry is too far out
+        if self._next_expiry_ts > cutoff:
+            return False
+        with self._lock:
+            return any(
+                t.market.strike_price is not None and now < t.market.end_ts <= cutoff
+                for t in self._trackers.values()
+            )
 
     def _reconnect_ws(self) -> None:
         if self._ws:
@@ -159,7 +302,7 @@ class TightnessTracker:
     def _ws_loop(self) -> None:
         while self._running:
             with self._lock:
-                tokens = list(self._token_to_market.keys())
+                tokens = list(self._token_lookup.keys())
             if not tokens:
                 time.sleep(1)
                 continue
@@ -180,7 +323,12 @@ class TightnessTracker:
                 f"[TMC] WS closed: {code} {msg}"
             ),
         )
-        self._ws.run_forever(ping_interval=30, ping_timeout=10)
+        # websocket-client validates UTF-8 byte by byte in Python; skipping
+        # it hands text frames over as raw bytes, which orjson parses (and
+        # validates) in C
+        self._ws.run_forever(
+            ping_interval=30, ping_timeout=10, skip_utf8_validation=True
+        )
 
     def _on_open(self, ws: websocket.WebSocket, tokens: list[str]) -> None:
         batch_size = 50
@@ -191,13 +339,17 @@ class TightnessTracker:
                 "channel": "book",
                 "assets_ids": batch,
             }
-            ws.send(json.dumps(msg))
+            ws.send(orjson.dumps(msg).decode())
         logger.info(f"[TMC] WS subscribed to {len(tokens)} tokens")
 
-    def _on_message(self, message: str) -> None:
+    def _on_message(self, message: bytes) -> None:
+        # Only frames carrying ask levels can produce a snapshot, so
+        # price changes, trades and acks are dropped before parsing
+        if b'"asks"' not in message:
+            return
         try:
-            data = json.loads(message)
-        except json.JSONDecodeError:
+            data = orjson.loads(message)
+        except orjson.JSONDecodeError:
             return
 
         if isinstance(data, list):
@@ -211,55 +363,55 @@ class TightnessTracker:
             return
 
         asset_id = data.get("asset_id")
-        if not asset_id:
+        asks = data.get("asks")
+        # Only book messages with asks produce a snapshot; other events
+        # (price changes, trades) return before taking the tracker lock
+        if not asset_id or not asks:
             return
 
-        with self._lock:
-            condition_id = self._token_to_market.get(asset_id)
-            if not condition_id:
-                return
-            tracker = self._trackers.get(condition_id)
-            if not tracker:
-                return
-            prices = self._current_prices.get(condition_id)
-            if prices is None:
-                return
-
-        # Extract best (lowest) ask price
-        asks = data.get("asks", [])
-        best_ask = None
-        if asks:
-            try:
-                if isinstance(asks[0], dict):
-                    all_asks = [float(a.get("price", 0)) for a in asks if float(a.get("price", 0)) > 0]
-                elif isinstance(asks[0], (list, tuple)):
-                    all_asks = [float(a[0]) for a in asks if float(a[0]) > 0]
-                else:
-                    all_asks = [float(a) for a in asks if float(a) > 0]
-                if all_asks:
-                    best_ask = min(all_asks)
-            except (ValueError, IndexError, TypeError):
-                pass
+        # Lock-free: the map is replaced, never mutated, once published
+        entry = self._token_lookup.get(asset_id)
+        if entry is None:
+            return
+        tracker, side, prices = entry
 
-        if best_ask is None:
+        # Extract best (lowest) ask price in one pass. The book's level order
+        # is not relied on (Polymarket sends asks best-last, not best-first)
+        best_ask = math.inf
+        try:
+            first = asks[0]
+            if isinstance(first, dict):
+                levels = (a.get("price", 0) for a in asks)
+            elif isinstance(first, (list, tuple)):
+                levels = (a[0] for a in asks)
+            else:
+                levels = asks
+            for level in levels:
+                p = float(level)
+                if 0 < p < best_ask:
+                    best_ask = p
+        except (ValueError, IndexError, TypeError):
             return
 
-        # Determine if YES or NO token
-        market = tracker.market
-        if asset_id == market.token_ids[0]:
-            prices["yes"] = best_ask
-        elif asset_id == market.token_ids[1]:
-            prices["no"] = best_ask
+        if best_ask == math.inf:
+            return
+
+        prices[side] = best_ask
 
         # Record snapshot when we have both sides
-        yes_price = prices.get("yes")
-        no_price = prices.get("no")
+        market = tracker.market
+        yes_price = prices["yes"]
+        no_price = prices["no"]
         if yes_price is not None and no_price is not None:
-            tracker.record(yes_price, no_price)
-            spread = abs(yes_price - 0.5)
-            remaining = max(0.0, market.end_date.timestamp() - time.time())
+            # One clock read stamps the snapshot and times the wake check
+            now = time.time()
+            tracker.record(yes_price, no_price, now)
+            remaining = max(0.0, market.end_ts - now)
+            if self._wake is not None and remaining <= self._wake_within:
+                self._wake.set()
             # Log every price update when close to expiry, otherwise sparse
-            if remaining <= 15:
+            if remaining <= 15 and logger.isEnabledFor(logging.INFO):
+                spread = math.fabs(yes_price - 0.5)
                 logger.info(
                     f"[TMC] WS PRICE {market.asset} '{market.question[:40]}' | "
                     f"YES={yes_price:.3f} NO={no_price:.3f} spread={spread:.4f} | "
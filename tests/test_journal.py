@@ -0,0 +1,44 @@
+import orjson
+
+from src.strategies.tight_market_crypto.journal import (
+    JournalWriter,
+    open_journal,
+    read_jsonl,
+)
+
+
+def test_append_after_torn_last_line_keeps_next_row(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    path.write_bytes(
+        orjson.dumps({"condition_id": "J1"}, option=orjson.OPT_APPEND_NEWLINE)
+        + b'{"condition_id": "J'  # crash mid-write of J2
+    )
+
+    with open_journal(path) as fh:
+        fh.write(orjson.dumps({"condition_id": "J3"}, option=orjson.OPT_APPEND_NEWLINE))
+
+    assert [r["condition_id"] for r in read_jsonl(path)] == ["J1", "J3"]
+
+
+def test_open_journal_leaves_intact_file_unchanged(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    data = orjson.dumps({"condition_id": "J1"}, option=orjson.OPT_APPEND_NEWLINE)
+    path.write_bytes(data)
+
+    open_journal(path).close()
+    open_journal(tmp_path / "new" / "empty.jsonl").close()
+
+    assert path.read_bytes() == data
+    assert (tmp_path / "new" / "empty.jsonl").read_bytes() == b""
+
+
+def test_writer_appends_in_order_and_drains_on_close(tmp_path):
+    path = tmp_path / "shadow.jsonl"
+    path.write_bytes(b'{"condition_id": "S')  # torn tail from a previous run
+    writer = JournalWriter("test-writer")
+    writer.start()
+    for cid in ("S1", "S2", "S3"):
+        assert writer.put(path, {"condition_id": cid})
+    writer.close()
+
+    assert [r["condition_id"] for r in read_jsonl(path)] == ["S1", "S2", "S3"]
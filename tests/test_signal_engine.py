@@ -0,0 +1,69 @@
+import math
+
+import pytest
+
+from src.strategies.tight_market_crypto.signal_engine import calc_prob_above, norm_cdf
+
+
+def _as_norm_cdf(x: float) -> float:
+    """The Abramowitz & Stegun norm_cdf the engine used before math.erf."""
+    if x < -8:
+        return 0.0
+    if x > 8:
+        return 1.0
+    a1, a2, a3, a4, a5 = (
+        0.254829592,
+        -0.284496736,
+        1.421413741,
+        -1.453152027,
+        1.061405429,
+    )
+    p = 0.3275911
+    sign = 1 if x >= 0 else -1
+    t = 1.0 / (1.0 + p * abs(x))
+    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(
+        -x * x / 2.0
+    )
+    return 0.5 * (1.0 + sign * y)
+
+
+@pytest.mark.parametrize(
+    "x, expected",
+    [
+        (0.0, 0.5),
+        (1.0, 0.8413447460685429),
+        (-1.0, 0.15865525393145707),
+        (1.96, 0.9750021048517795),
+        (-3.0, 0.0013498980316301035),
+    ],
+)
+def test_norm_cdf_matches_exact_values(x, expected):
+    assert norm_cdf(x) == pytest.approx(expected, abs=1e-15)
+
+
+@pytest.mark.parametrize(
+    "price, strike, expected",
+    [
+        (100.0, 100.0, 0.49800529690925915),  # at the strike: drift term only
+        (101.0, 100.0, 0.8389210260889319),
+    ],
+)
+def test_calc_prob_above_matches_exact_values(price, strike, expected):
+    assert calc_prob_above(price, strike, 0.001, 100.0) == pytest.approx(
+        expected, abs=1e-12
+    )
+
+
+def test_calc_prob_above_degenerate_inputs():
+    assert calc_prob_above(0.0, 100.0, 0.001, 100.0) == 0.5
+    assert calc_prob_above(100.0, 100.0, 0.0, 100.0) == 0.5
+    assert calc_prob_above(100.0, 100.0, 0.001, 0.0) == 0.5
+
+
+def test_norm_cdf_shift_from_old_approximation_is_bounded():
+    # The old polynomial was fed exp(-x²/2) instead of erf's exp(-x²), so it
+    # was off by up to ~0.037 (near |x| = 0.57); the erf CDF moves the
+    # probability gate by at most that much
+    xs = [i / 1000 for i in range(-8000, 8001)]
+    max_diff = max(abs(norm_cdf(x) - _as_norm_cdf(x)) for x in xs)
+    assert 0.03 < max_diff < 0.038